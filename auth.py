@@ -0,0 +1,142 @@
+"""แฮชและตรวจรหัสผ่าน
+
+รหัสผ่านเก็บเป็นสตริงที่มีเวอร์ชันกำกับ "pbkdf2_sha256$<รอบ>$<salt>$<hash>" (base64)
+รหัสผ่านเก่าที่เป็น SHA-256 hex ไม่มี salt ยังเข้าสู่ระบบได้ และจะถูกแฮชใหม่ทันทีที่เข้าสู่ระบบสำเร็จ
+เช่นเดียวกับแฮชที่ใช้จำนวนรอบต่างจากค่าปัจจุบัน
+
+ปรับความหนักของ PBKDF2 ด้วย STUDY_PLANNER_PBKDF2_ITERATIONS และจำนวน thread ที่ใช้แฮช
+พร้อมกันด้วย STUDY_PLANNER_VERIFY_WORKERS การแฮชทั้งหมดทำใน thread pool ที่จำกัดขนาด
+ผู้ที่เข้าสู่ระบบพร้อมกันจำนวนมากจึงต่อคิวกันแทนที่จะแย่ง CPU จาก session อื่นทั้งหมด
+
+วัด throughput ของการเข้าสู่ระบบที่จำนวนรอบต่าง ๆ:
+    python auth.py bench --iterations 100000 300000 600000 --workers 1 4 --logins 32
+"""
+import base64
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import hashlib
+import hmac
+import os
+import secrets
+import time
+
+HASH_SCHEME = "pbkdf2_sha256"
+PBKDF2_ITERATIONS = int(os.environ.get("STUDY_PLANNER_PBKDF2_ITERATIONS", 600_000))
+SALT_BYTES = 16
+VERIFY_WORKERS = int(os.environ.get("STUDY_PLANNER_VERIFY_WORKERS", 4))
+VERIFY_TIMEOUT = 30
+
+class AuthBusyError(RuntimeError):
+    """คิวการตรวจรหัสผ่านยาวเกินเวลาที่รอได้"""
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+def legacy_hash(password):
+    """แฮชแบบเดิม (SHA-256 ไม่มี salt) ใช้ตรวจบัญชีเก่าเท่านั้น"""
+    return hashlib.sha256(password.encode()).hexdigest()
+
+def hash_password(password, iterations=None):
+    iterations = iterations or PBKDF2_ITERATIONS
+    salt = secrets.token_bytes(SALT_BYTES)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return f"{HASH_SCHEME}${iterations}${_b64(salt)}${_b64(digest)}"
+
+def verify_password(password, stored):
+    """เทียบรหัสผ่านกับค่าที่เก็บไว้ (แบบใหม่หรือ SHA-256 เดิม) ด้วยเวลาคงที่"""
+    if "$" not in stored:
+        return hmac.compare_digest(legacy_hash(password), stored)
+    try:
+        scheme, iterations, salt, digest = stored.split("$")
+        if scheme != HASH_SCHEME:
+            return False
+        expected = base64.b64decode(digest)
+        actual = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), base64.b64decode(salt), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(actual, expected)
+
+def needs_rehash(stored, iterations=None):
+    """True ถ้าเป็นแฮชเดิมหรือใช้จำนวนรอบไม่ตรงกับค่าปัจจุบัน"""
+    return not stored.startswith(f"{HASH_SCHEME}${iterations or PBKDF2_ITERATIONS}$")
+
+# ใช้ตรวจกับอีเมลที่ไม่มีในระบบ ให้เวลาตอบเท่ากับกรณีรหัสผ่านผิด ผลแฮชเป็นไบต์สุ่ม (ไม่ตรงกับรหัสใด)
+# จึงสร้างได้ทันทีตอน import โดยไม่ต้องรัน PBKDF2 นอก thread pool
+_DUMMY_HASH = f"{HASH_SCHEME}${PBKDF2_ITERATIONS}${_b64(secrets.token_bytes(SALT_BYTES))}${_b64(secrets.token_bytes(32))}"
+
+_executor = ThreadPoolExecutor(max_workers=VERIFY_WORKERS, thread_name_prefix="password-hash")
+
+def run_hashing(func, *args, timeout=VERIFY_TIMEOUT):
+    """เรียก func(*args) ใน thread pool ของการแฮช รอไม่เกิน timeout วินาที"""
+    future = _executor.submit(func, *args)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise AuthBusyError("password hashing queue is full") from None
+
+def authenticate(store, email, password, timeout=VERIFY_TIMEOUT):
+    """ตรวจอีเมลและรหัสผ่าน คืนค่า True ถ้าถูกต้อง
+
+    ถ้ารหัสผ่านถูกแต่แฮชเป็นแบบเดิม จะแฮชใหม่แล้วบันทึกทับทันที
+    """
+    user = store.get_user(email)
+    stored = user["password"] if user is not None else _DUMMY_HASH
+    if not run_hashing(verify_password, password, stored, timeout=timeout) or user is None:
+        return False
+    if needs_rehash(stored):
+        store.update_user(email, {**user, "password": run_hashing(hash_password, password, timeout=timeout)})
+    return True
+
+def register(store, email, password, created_at, timeout=VERIFY_TIMEOUT):
+    """สร้างบัญชีใหม่ คืนค่า False ถ้ามีอีเมลนี้อยู่แล้ว"""
+    if store.get_user(email) is not None:
+        return False
+    password_hash = run_hashing(hash_password, password, timeout=timeout)
+    return store.create_user(email, {"password": password_hash, "created_at": created_at})
+
+def benchmark(iterations_list, workers_list, logins):
+    """จำลองการเข้าสู่ระบบพร้อมกัน logins ครั้ง คืน list ของผลต่อ (จำนวนรอบ, จำนวน thread)"""
+    results = []
+    for iterations in iterations_list:
+        stored = hash_password("correct horse", iterations)
+        for workers in workers_list:
+            latencies = []
+
+            def login(submitted):
+                verify_password("correct horse", stored)
+                # นับรวมเวลาที่รอคิว เหมือนที่ผู้ใช้รอจริง
+                latencies.append(time.perf_counter() - submitted)
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for _ in range(logins):
+                    pool.submit(login, time.perf_counter())
+            elapsed = time.perf_counter() - started
+            latencies.sort()
+            results.append({
+                "iterations": iterations,
+                "workers": workers,
+                "logins_per_second": logins / elapsed,
+                "p50_ms": latencies[len(latencies) // 2] * 1000,
+                "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+                "max_ms": latencies[-1] * 1000,
+            })
+    return results
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="เครื่องมือรหัสผ่านของ STUDY PLANNER")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    bench_parser = subparsers.add_parser("bench", help="วัด throughput การเข้าสู่ระบบที่ความหนักต่าง ๆ")
+    bench_parser.add_argument("--iterations", type=int, nargs="+", default=[100_000, 300_000, PBKDF2_ITERATIONS])
+    bench_parser.add_argument("--workers", type=int, nargs="+", default=[1, VERIFY_WORKERS])
+    bench_parser.add_argument("--logins", type=int, default=32)
+    args = parser.parse_args()
+    if args.command == "bench":
+        print(f"{'รอบ':>9} {'threads':>7} {'login/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+        for row in benchmark(args.iterations, args.workers, args.logins):
+            print(
+                f"{row['iterations']:>9} {row['workers']:>7} {row['logins_per_second']:>8.1f} "
+                f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['max_ms']:>8.1f}"
+            )
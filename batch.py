@@ -0,0 +1,393 @@
+"""งานแบบไม่มีหน้าจอ: นำเข้า/ส่งออกตาราง และจัดตารางอัตโนมัติให้ผู้ใช้ครั้งละหลายคน
+
+ใช้ store ตัวเดียวกับแอป (STUDY_PLANNER_STORAGE) และเงื่อนไขเวลาทับซ้อนเดียวกับ check_time_conflict
+รายการที่ทับซ้อนกับตารางเดิม (หรือกับแถวก่อนหน้าในไฟล์) จะถูกข้ามและรายงาน ไม่บันทึกทับ
+แถวที่อ่านไม่ได้ (JSON เสีย เวลา/ค่าไม่ถูกต้อง) ก็ถูกข้ามและรายงานพร้อมเลขบรรทัด ไม่หยุดทั้งไฟล์
+
+อ่านไฟล์ input ทีละแถว แล้วส่งเป็นชุดของผู้ใช้คนเดียวเข้า process pool โดยมีงานค้างไม่เกินที่กำหนด
+หน่วยความจำจึงไม่ขึ้นกับขนาดไฟล์ งานของผู้ใช้คนเดียวกันทำตามลำดับเสมอ ผู้ใช้ต่างกันทำขนานกัน
+
+    python batch.py import schedules.csv --dir data --workers 8
+    python batch.py import calendar.ics --user a@b.c
+    python batch.py plan spec.csv --dir data
+    python batch.py export a@b.c --format ics --output a.ics
+    python batch.py export a@b.c --format ics --output changes.ics --token-file a.token
+
+CSV ของ import ต้องมีคอลัมน์ subject, date, start, end (priority, completed ไม่บังคับ)
+และ email ถ้าไม่ได้ระบุ --user ไฟล์ .ics ใช้ SUMMARY, DTSTART และ DTEND ของแต่ละ VEVENT
+
+spec ของ plan เป็น CSV หรือ JSON lines หนึ่งแถวต่อหนึ่งวิชา มีคอลัมน์ email, subject, exam_date,
+hours_per_day (start_date ไม่บังคับ) และ password ถ้าต้องการสร้างบัญชีให้ผู้ใช้ที่ยังไม่มี
+
+export ด้วย --token-file จะส่งออกเฉพาะส่วนที่เปลี่ยนตั้งแต่ token ในไฟล์ (ไม่มีไฟล์ = ทั้งตาราง)
+แล้วเขียน token ใหม่ลงไฟล์หลังเขียนเอกสารเสร็จ
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import csv
+from datetime import date, datetime, timezone
+import json
+import os
+import sys
+
+from auth import register
+from export import COMPLETED_PROPERTY, FORMATS, export, sync
+from metrics import metrics
+from scheduling import ScheduleIndex, ScheduleItem, auto_schedule_subject, from_day
+from storage import get_store, schedule_filename
+
+BATCH_SIZE = 1000
+MAX_BUFFERED_ROWS = 20_000
+TRUE_VALUES = {"1", "true", "yes", "y"}
+
+# ---------------------- INPUT ----------------------
+def read_csv(f, user=None):
+    """(email, แถว) ทีละแถวจาก CSV แถวมีคีย์ "line" เป็นเลขบรรทัดสำหรับรายงานข้อผิดพลาด"""
+    reader = csv.DictReader(f)
+    if user is None and "email" not in (reader.fieldnames or ()):
+        raise ValueError("ไฟล์ CSV ต้องมีคอลัมน์ email หรือระบุ --user")
+    for row in reader:
+        email = user or (row.get("email") or "").strip()
+        if email:
+            yield email, {**row, "line": reader.line_num}
+
+def read_json_lines(f, user=None):
+    """(email, แถว) ทีละบรรทัด บรรทัดที่ไม่ใช่ JSON object จะได้แถวที่มีคีย์ "error" แทนการหยุดทั้งไฟล์"""
+    for line_num, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError("ต้องเป็น JSON object")
+        except ValueError as error:
+            # ไม่รู้อีเมลของบรรทัดที่อ่านไม่ได้ ถ้าไม่ได้ระบุ --user จะรายงานภายใต้อีเมลว่าง
+            yield user or "", {"line": line_num, "error": f"JSON ไม่ถูกต้อง: {error}"}
+            continue
+        email = user or str(row.get("email") or "").strip()
+        if email:
+            yield email, {**row, "line": line_num}
+
+def unfold_ics(f):
+    """บรรทัดของ iCalendar หลังต่อบรรทัดที่ถูกพับ (บรรทัดที่ขึ้นต้นด้วยช่องว่างต่อจากบรรทัดก่อน)"""
+    current = None
+    for line in f:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+def parse_ics_datetime(value, params):
+    """DTSTART/DTEND เป็น datetime เวลาท้องถิ่น คืน None ถ้าเป็นทั้งวัน (VALUE=DATE)"""
+    if "VALUE=DATE" in params or "T" not in value:
+        return None
+    if value.endswith("Z"):
+        utc = datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+        return utc.astimezone().replace(tzinfo=None)
+    # TZID ถือเป็นเวลาท้องถิ่นตามที่เขียนไว้
+    return datetime.strptime(value[:15], "%Y%m%dT%H%M%S")
+
+def read_ics(f, user):
+    """(user, แถว) ทีละ VEVENT ในรูปแบบเดียวกับแถว CSV ค่าที่อ่านไม่ได้จะอยู่ในคีย์ "error" ของแถว"""
+    event = None
+    for line_num, line in enumerate(unfold_ics(f), 1):
+        name, _, value = line.partition(":")
+        name, _, params = name.partition(";")
+        name = name.upper()
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            event = {"line": line_num}
+        elif event is None:
+            continue
+        elif name == "END" and value.upper() == "VEVENT":
+            yield user, event
+            event = None
+        elif name == "SUMMARY":
+            event["subject"] = value.replace("\\,", ",").replace("\\;", ";").replace("\\n", " ").replace("\\\\", "\\")
+        elif name in ("DTSTART", "DTEND"):
+            try:
+                event[name] = parse_ics_datetime(value, params.upper())
+            except ValueError:
+                event.setdefault("error", f"{name} ไม่ถูกต้อง: {value!r}")
+        elif name == "PRIORITY" and value.strip() not in ("", "0"):
+            # PRIORITY ของ iCalendar คือ 1-9 (1 = สูงสุด) ตัดให้อยู่ในช่วง 1-5 ของแอป
+            try:
+                event["priority"] = min(int(value), 5)
+            except ValueError:
+                event.setdefault("error", f"PRIORITY ไม่ถูกต้อง: {value!r}")
+        elif name == COMPLETED_PROPERTY:
+            event["completed"] = value.strip()
+        elif name == "STATUS":
+            event["deleted"] = str(value.upper() == "CANCELLED")
+
+def ics_row(event):
+    """แปลง VEVENT เป็นแถวแบบ CSV ยกเว้นทั้งวันหรือข้ามวันซึ่งเก็บในตารางไม่ได้"""
+    start, end = event.get("DTSTART"), event.get("DTEND")
+    if start is None or end is None:
+        raise ValueError("ไม่มีเวลาเริ่ม/สิ้นสุด (กิจกรรมทั้งวันหรือไม่มี DTEND)")
+    if start.date() != end.date():
+        raise ValueError("กิจกรรมข้ามวัน")
+    return {
+        "subject": event.get("subject", ""),
+        "date": start.date().isoformat(),
+        "start": start.strftime("%H:%M"),
+        "end": end.strftime("%H:%M"),
+        "priority": event.get("priority"),
+        "completed": event.get("completed", ""),
+    }
+
+def read_rows(path, user=None, fmt=None):
+    """อ่าน (email, แถว) ทีละแถวจากไฟล์ .csv, .ics หรือ .jsonl ("-" = stdin)"""
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    f = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8-sig")
+    try:
+        if fmt == "csv":
+            yield from read_csv(f, user)
+        elif fmt == "ics":
+            if user is None:
+                raise ValueError("ไฟล์ .ics ต้องระบุ --user")
+            yield from read_ics(f, user)
+        elif fmt in ("jsonl", "json"):
+            yield from read_json_lines(f, user)
+        else:
+            raise ValueError(f"ไม่รู้จักรูปแบบไฟล์ {fmt!r} (ใช้ csv, ics หรือ jsonl)")
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def group_rows(rows, batch_size=BATCH_SIZE, max_buffered=MAX_BUFFERED_ROWS):
+    """รวมแถวเป็นชุด (email, [แถว]) ของผู้ใช้คนเดียว ชุดละไม่เกิน batch_size
+
+    เก็บแถวที่ยังไม่ส่งรวมกันไม่เกิน max_buffered ถ้าเกินจะส่งทุกชุดที่ค้างอยู่ออกไปก่อน
+    ไฟล์ที่เรียงตามผู้ใช้จึงได้ชุดใหญ่ ส่วนไฟล์ที่สลับผู้ใช้ไปมายังใช้หน่วยความจำจำกัด
+    """
+    buffers = {}
+    buffered = 0
+    for email, row in rows:
+        buffer = buffers.setdefault(email, [])
+        buffer.append(row)
+        buffered += 1
+        if len(buffer) >= batch_size:
+            yield email, buffers.pop(email)
+            buffered -= len(buffer)
+        elif buffered >= max_buffered:
+            yield from buffers.items()
+            buffers = {}
+            buffered = 0
+    yield from buffers.items()
+
+# ---------------------- WORKERS ----------------------
+_worker_store = None
+
+def worker_store():
+    """store ของ process นี้ (สร้างครั้งแรกที่ใช้ แต่ละ process ของ pool มี connection/แคชของตัวเอง)"""
+    global _worker_store
+    if _worker_store is None:
+        _worker_store = get_store()
+    return _worker_store
+
+def new_result(email):
+    return {"email": email, "added": 0, "conflicts": [], "errors": []}
+
+def import_rows(email, rows):
+    """เพิ่มแถวของผู้ใช้หนึ่งคน ข้ามแถวที่ทับซ้อนกับตารางเดิมหรือแถวก่อนหน้า แล้วบันทึกครั้งเดียว"""
+    store = worker_store()
+    filename = schedule_filename(email)
+    result = new_result(email)
+    items = []
+    for row in rows:
+        # แถวที่ส่งออกจากการซิงก์ว่าถูกลบ ไม่มีอะไรให้นำเข้า
+        if str(row.get("deleted", "")).strip().lower() in TRUE_VALUES:
+            continue
+        try:
+            if row.get("error"):
+                raise ValueError(row["error"])
+            if "DTSTART" in row or "DTEND" in row:
+                row = {**ics_row(row), "line": row["line"]}
+            item = ScheduleItem.from_dict({
+                "subject": row["subject"].strip(),
+                "date": row["date"].strip(),
+                "start": row["start"].strip(),
+                "end": row["end"].strip(),
+                "priority": row.get("priority") or 3,
+                "completed": str(row.get("completed", "")).strip().lower() in TRUE_VALUES,
+                "auto_generated": str(row.get("auto_generated", "")).strip().lower() in TRUE_VALUES,
+            })
+            if not item.subject:
+                raise ValueError("ไม่มีชื่อวิชา")
+            if item.start_minute >= item.end_minute:
+                raise ValueError("เวลาเริ่มต้องน้อยกว่าสิ้นสุด")
+        except (KeyError, ValueError, AttributeError) as error:
+            result["errors"].append(f"บรรทัด {row['line']}: {error}")
+            continue
+        items.append(item)
+    if not items:
+        return result
+
+    # ตรวจเฉพาะรายการเดิมในช่วงวันที่ของชุดนี้ เหมือนการเพิ่มแบบกำหนดเองในแอป
+    first_day = min(item.day for item in items)
+    last_day = max(item.day for item in items)
+    index = ScheduleIndex(store.items_between(filename, from_day(first_day), from_day(last_day)))
+    metrics.count("conflict_checks", len(items))
+    new_items = []
+    for item in items:
+        if index.has_conflict(item.day, item.start_minute, item.end_minute):
+            result["conflicts"].append(f"{item.date} {item.start}-{item.end} {item.subject}")
+        else:
+            index.add(item)
+            new_items.append(item)
+    if new_items:
+        store.add(filename, new_items)
+    result["added"] = len(new_items)
+    return result
+
+def plan_rows(email, rows, seed=None):
+    """จัดตารางอัตโนมัติทีละวิชาตามลำดับในไฟล์ วิชาหลังจึงหลบเวลาของวิชาก่อนหน้า"""
+    store = worker_store()
+    filename = schedule_filename(email)
+    result = new_result(email)
+    password = next((row["password"] for row in rows if row.get("password")), None)
+    if password and store.get_user(email) is None:
+        register(store, email, password, datetime.now().isoformat())
+    for row in rows:
+        try:
+            if row.get("error"):
+                raise ValueError(row["error"])
+            subject = row["subject"].strip()
+            exam_date = date.fromisoformat(str(row["exam_date"]).strip())
+            hours_per_day = float(row["hours_per_day"])
+            start_date = date.fromisoformat(str(row["start_date"]).strip()) if row.get("start_date") else None
+            if not subject or hours_per_day <= 0:
+                raise ValueError("ต้องมีชื่อวิชาและชั่วโมงต่อวันมากกว่า 0")
+        except (KeyError, ValueError, AttributeError) as error:
+            result["errors"].append(f"บรรทัด {row['line']}: {error}")
+            continue
+        items = auto_schedule_subject(store, filename, subject, exam_date, hours_per_day, start_date, seed)
+        if not items:
+            result["errors"].append(f"บรรทัด {row['line']}: จัดตาราง {subject} ไม่ได้ (วันสอบใกล้เกินไปหรือไม่มีเวลาว่าง)")
+            continue
+        store.add(filename, items)
+        result["added"] += len(items)
+    return result
+
+def run_by_user(func, jobs, workers, args=(), max_pending=None):
+    """เรียก func(email, rows, *args) กับทุกชุดใน jobs แล้วคืนผลตามลำดับที่เสร็จ
+
+    workers > 1 ใช้ process pool โดยส่งงานค้างไม่เกิน max_pending และไม่ส่งชุดถัดไปของผู้ใช้
+    จนกว่าชุดก่อนหน้าของผู้ใช้คนนั้นจะเสร็จ จึงไม่มีสองชุดของผู้ใช้เดียวกันตรวจเวลาทับซ้อนพร้อมกัน
+    """
+    if workers <= 1:
+        for email, rows in jobs:
+            yield func(email, rows, *args)
+        return
+    max_pending = max_pending or workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}  # future -> email
+        running = {}  # email -> future ล่าสุดที่ยังไม่เสร็จ
+        for email, rows in jobs:
+            while pending and (len(pending) >= max_pending or email in running):
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished = pending.pop(future)
+                    if running.get(finished) is future:
+                        del running[finished]
+                    yield future.result()
+            future = pool.submit(func, email, rows, *args)
+            pending[future] = email
+            running[email] = future
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                del pending[future]
+                yield future.result()
+
+# ---------------------- OUTPUT ----------------------
+def print_results(results, verbose=False):
+    """พิมพ์ผลของผู้ใช้ที่มีปัญหา (หรือทุกคนเมื่อ verbose) แล้วคืนยอดรวม"""
+    totals = {"added": 0, "conflicts": 0, "errors": 0}
+    emails = set()
+    for result in results:
+        if result["email"]:
+            emails.add(result["email"])
+        totals["added"] += result["added"]
+        totals["conflicts"] += len(result["conflicts"])
+        totals["errors"] += len(result["errors"])
+        if verbose or result["conflicts"] or result["errors"]:
+            print(f"{result['email'] or '(ไม่ทราบอีเมล)'}: เพิ่ม {result['added']} รายการ")
+            for conflict in result["conflicts"]:
+                print(f"  - ทับซ้อน: {conflict}")
+            for error in result["errors"]:
+                print(f"  - {error}")
+    return {"users": len(emails), **totals}
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="นำเข้า/ส่งออก และจัดตารางหลายผู้ใช้ของ STUDY PLANNER")
+    parser.add_argument("--dir", default=".", help="โฟลเดอร์ข้อมูลของแอป (ที่มี data_*.json / users)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="นำเข้ารายการจาก CSV, iCalendar หรือ JSON lines")
+    plan_parser = subparsers.add_parser("plan", help="จัดตารางอัตโนมัติตามไฟล์ spec")
+    for sub in (import_parser, plan_parser):
+        sub.add_argument("input", help='ไฟล์ input ("-" = stdin)')
+        sub.add_argument("--format", choices=["csv", "ics", "jsonl"], help="ไม่ระบุ = ดูจากนามสกุลไฟล์")
+        sub.add_argument("--user", help="อีเมลของผู้ใช้ทุกแถว (แทนคอลัมน์ email)")
+        sub.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        sub.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        sub.add_argument("--verbose", action="store_true", help="พิมพ์ผลของทุกผู้ใช้")
+    plan_parser.add_argument("--seed", type=int, help="ให้ผลการสุ่มเวลาเหมือนเดิมทุกครั้ง")
+    export_parser = subparsers.add_parser("export", help="ส่งออกตารางของผู้ใช้")
+    export_parser.add_argument("email")
+    export_parser.add_argument("--format", choices=list(FORMATS), default="csv")
+    export_parser.add_argument("--from", dest="start_date", help="YYYY-MM-DD")
+    export_parser.add_argument("--to", dest="end_date", help="YYYY-MM-DD")
+    export_parser.add_argument("--output", help="ไม่ระบุ = พิมพ์ออกหน้าจอ")
+    export_parser.add_argument("--token-file", help="ส่งออกเฉพาะที่เปลี่ยนตั้งแต่ token ในไฟล์นี้ (ใช้แทน --from/--to)")
+    args = parser.parse_args()
+    # path ของไฟล์ input/output อ้างจากที่สั่งรัน ส่วนข้อมูลของแอปอ้างจาก --dir
+    if getattr(args, "input", "-") != "-":
+        args.input = os.path.abspath(args.input)
+    for name in ("output", "token_file"):
+        if getattr(args, name, None):
+            setattr(args, name, os.path.abspath(getattr(args, name)))
+    os.chdir(args.dir)
+    try:
+        if args.command == "import":
+            jobs = group_rows(read_rows(args.input, args.user, args.format), args.batch_size)
+            results = run_by_user(import_rows, jobs, args.workers)
+        elif args.command == "plan":
+            jobs = group_rows(read_rows(args.input, args.user, args.format), args.batch_size)
+            results = run_by_user(plan_rows, jobs, args.workers, (args.seed,))
+        if args.command in ("import", "plan"):
+            totals = print_results(results, args.verbose)
+            print(
+                f"ผู้ใช้ {totals['users']} คน เพิ่ม {totals['added']} รายการ "
+                f"ทับซ้อน {totals['conflicts']} ข้อผิดพลาด {totals['errors']}"
+            )
+        else:
+            store = get_store()
+            filename = schedule_filename(args.email)
+            if args.token_file:
+                token = None
+                if os.path.exists(args.token_file):
+                    with open(args.token_file, encoding="utf-8") as f:
+                        token = f.read().strip()
+                token, full, chunks = sync(store, filename, args.format, token)
+            else:
+                chunks = export(store, filename, args.format, args.start_date, args.end_date)
+            if args.output:
+                with open(args.output, "w", newline="", encoding="utf-8") as f:
+                    f.writelines(chunks)
+            else:
+                sys.stdout.writelines(chunks)
+            if args.token_file:
+                with open(args.token_file, "w", encoding="utf-8") as f:
+                    f.write(token + "\n")
+            if args.output:
+                scope = "ทั้งตาราง" if not args.token_file or full else "เฉพาะที่เปลี่ยน"
+                print(f"ส่งออก{scope}ไปยัง {args.output}")
+    except (OSError, ValueError) as error:
+        parser.exit(1, f"{error}\n")
@@ -0,0 +1,146 @@
+"""วัดความเร็วของงานหลักด้วยผู้ใช้จำลองที่มี 100 ถึง 100k รายการ แล้วพิมพ์ผลเป็น JSON
+
+ไม่เรียก streamlit เลย (ใช้ตรรกะใน scheduling/storage/views/export โดยตรง) จึงรันได้ทุกที่:
+    python benchmark.py --sizes 100 1000 10000 100000 --output bench.json
+
+เก็บไฟล์ผลของแต่ละ commit ไว้เทียบกัน ค่า "seconds" คือค่ากลาง (median) ของการรันซ้ำ
+"""
+import argparse
+from datetime import date, timedelta
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+
+from export import export
+from scheduling import (
+    Schedule, ScheduleIndex, ScheduleItem, calc_total_hours, check_time_conflict,
+    from_day, plan_manual_items, schedule_single_subject,
+)
+from storage import JournalStore, JsonStore, SqliteStore, load_cache
+from views import build_daily_view, display_rows
+
+SIZES = (100, 1_000, 10_000, 100_000)
+ITEMS_PER_DAY = 4
+SUBJECTS = [f"วิชา {i}" for i in range(20)]
+SLOTS = [(8 * 60, 10 * 60), (10 * 60, 11 * 60), (13 * 60, 15 * 60), (19 * 60, 21 * 60)]
+
+def synthetic_schedule(size, start=None, seed=0):
+    """ตารางของผู้ใช้จำลอง วันละ ITEMS_PER_DAY รายการในช่วงเวลาคงที่ ต่อเนื่องตั้งแต่ start"""
+    rng = random.Random(seed)
+    first_day = (start or date.today()).toordinal() - size // ITEMS_PER_DAY // 2
+    schedule = Schedule()
+    for i in range(size):
+        start_minute, end_minute = SLOTS[i % ITEMS_PER_DAY]
+        schedule.append(ScheduleItem(
+            rng.choice(SUBJECTS), first_day + i // ITEMS_PER_DAY, start_minute, end_minute,
+            priority=rng.randint(1, 5), completed=rng.random() < 0.3, auto_generated=rng.random() < 0.5,
+        ))
+    return schedule
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return {"seconds": statistics.median(timings), "min_seconds": min(timings), "repeat": repeat}
+
+def bench_size(size, repeat, workdir):
+    schedule = synthetic_schedule(size)
+    today = date.today()
+    week = [item for item in schedule if today.toordinal() <= item.day < today.toordinal() + 7]
+    queries = [(from_day(item.day), "09:30", "10:30") for item in random.Random(1).sample(list(schedule), min(100, size))]
+    results = {}
+
+    # การตรวจเวลาทับซ้อน 100 ครั้ง: ไล่ทั้ง list (แบบเดิม) เทียบกับดัชนี
+    results["check_time_conflict.list"] = measure(
+        lambda: [check_time_conflict(schedule, *q) for q in queries], repeat)
+    index = ScheduleIndex(schedule)
+    results["check_time_conflict.index"] = measure(
+        lambda: [check_time_conflict(index, *q) for q in queries], repeat)
+    results["schedule_index.build"] = measure(lambda: ScheduleIndex(schedule), repeat)
+
+    # จัดตารางอัตโนมัติ 30 วัน และเพิ่มแบบกำหนดเอง 30 วัน เทียบกับรายการในช่วงนั้น
+    exam_date = today + timedelta(days=30)
+    window = [item for item in schedule if today.toordinal() <= item.day <= exam_date.toordinal()]
+    results["auto_schedule_subject"] = measure(
+        lambda: schedule_single_subject("ทดสอบ", exam_date, 2.0, window, today, seed=0), repeat)
+    results["manual_add.30_days"] = measure(
+        lambda: plan_manual_items(window, "ทดสอบ", today, exam_date, 6 * 60, 7 * 60), repeat)
+    results["calc_total_hours"] = measure(lambda: calc_total_hours(schedule), repeat)
+
+    # หน้า "ดูตาราง": หนึ่งสัปดาห์ (ค่าเริ่มต้นของหน้า) และทั้งตาราง
+    results["view.week"] = measure(
+        lambda: (build_daily_view(week, today.toordinal()), display_rows(week)), repeat)
+    results["view.all"] = measure(
+        lambda: (build_daily_view(schedule, today.toordinal()), display_rows(schedule)), repeat)
+
+    # load/save ของแต่ละ backend: เขียนทั้งตาราง, โหลดครั้งแรก (ไม่มีแคช), โหลดซ้ำ, แก้หนึ่งรายการ
+    stores = {
+        "json": JsonStore(),
+        "journal": JournalStore(),
+        "sqlite": SqliteStore(os.path.join(workdir, f"bench_{size}.db")),
+    }
+    for mode, store in stores.items():
+        filename = os.path.join(workdir, f"data_{mode}_{size}.json")
+        # สำเนาแยกต่อ backend เพราะ store ถือและแก้ออบเจกต์รายการที่บันทึกไว้ในแคช
+        copy = Schedule(ScheduleItem.from_dict(item.to_dict()) for item in schedule)
+        results[f"{mode}.save"] = measure(lambda: store.save(filename, copy), repeat)
+
+        def cold_load():
+            load_cache.clear()
+            store.load(filename)
+
+        results[f"{mode}.load_cold"] = measure(cold_load, repeat)
+        results[f"{mode}.load_warm"] = measure(lambda: store.load(filename), repeat)
+        item_id = copy[size // 2].id
+        results[f"{mode}.update_one"] = measure(
+            lambda: store.update(filename, item_id, completed=True), repeat)
+        results[f"{mode}.items_between.week"] = measure(
+            lambda: store.items_between(filename, today.isoformat(), (today + timedelta(days=6)).isoformat()),
+            repeat)
+        # ส่งออกทั้งตาราง และซิงก์หลังแก้หนึ่งรายการ (ควรไม่ขึ้นกับขนาดตาราง)
+        results[f"{mode}.export_ics"] = measure(lambda: sum(1 for _ in export(store, filename, "ics")), repeat)
+        token = store.changes_since(filename)["token"]
+        store.update(filename, item_id, completed=False)
+        results[f"{mode}.sync.one_change"] = measure(
+            lambda: list(store.changes_since(filename, token)["items"]), repeat)
+    return [{"name": name, "size": size, **timing} for name, timing in results.items()]
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(sizes=SIZES, repeat=5):
+    with tempfile.TemporaryDirectory(prefix="study_planner_bench_") as workdir:
+        results = [row for size in sizes for row in bench_size(size, repeat, workdir)]
+    return {
+        "commit": git_revision(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="วัดความเร็วของ STUDY PLANNER")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="ไฟล์ JSON ที่จะเขียนผล (ไม่ระบุ = พิมพ์ออกหน้าจอ)")
+    args = parser.parse_args()
+    report = run(args.sizes, args.repeat)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
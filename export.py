@@ -0,0 +1,92 @@
+"""ส่งออกตารางเป็น iCalendar (.ics) หรือ CSV แบบ streaming และซิงก์เฉพาะส่วนที่เปลี่ยน
+
+iter_ics/iter_csv เป็น generator ที่คืนเอกสารทีละบรรทัด (ทีละรายการ) ไม่สร้างทั้งเอกสารในหน่วยความจำ
+ใช้กับ store.iter_items() ซึ่งใน SQLite อ่านจาก cursor ทีละแถว การส่งออกตารางใหญ่จึงใช้หน่วยความจำคงที่
+(โหมด json/journal มีทั้งตารางในหน่วยความจำอยู่แล้ว และ iter_items ยังต้องเรียงรายการเป็น list ก่อน)
+
+sync() ส่งออกเฉพาะรายการที่เพิ่ม/แก้/ลบหลัง token ที่ได้จากครั้งก่อน (ดู store.changes_since)
+รายการที่ถูกลบจะออกเป็น VEVENT ที่มี STATUS:CANCELLED หรือแถว CSV ที่ deleted=1
+ผู้ใช้ควรเก็บ token ใหม่หลังนำเอกสารไปใช้สำเร็จแล้วเท่านั้น
+"""
+import csv
+from datetime import datetime, timezone
+
+CSV_COLUMNS = ["id", "subject", "date", "start", "end", "priority", "completed", "auto_generated", "deleted"]
+ICS_HEADER = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//STUDY PLANNER//TH", "X-WR-CALNAME:STUDY PLANNER"]
+UID_DOMAIN = "study-planner"
+# STATUS ของ VEVENT มีแค่ TENTATIVE/CONFIRMED/CANCELLED (COMPLETED ใช้ได้กับ VTODO เท่านั้น)
+# สถานะอ่านจบจึงเก็บใน property ของแอปเอง
+COMPLETED_PROPERTY = "X-STUDY-PLANNER-COMPLETED"
+
+class _Echo:
+    """"ไฟล์" ที่ write คืนค่าที่เขียนกลับมา ให้ csv.writer แปลงทีละแถวเป็นสตริงได้"""
+
+    def write(self, value):
+        return value
+
+def ics_escape(text):
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def ics_fold(line):
+    """พับบรรทัดที่ยาวเกิน 75 ไบต์ตาม RFC 5545 (ไม่ตัดกลางตัวอักษร UTF-8)"""
+    parts = []
+    current = ""
+    for char in line:
+        if len((current + char).encode("utf-8")) > (75 if not parts else 74):
+            parts.append(current)
+            current = ""
+        current += char
+    parts.append(current)
+    return "\r\n ".join(parts)
+
+def iter_csv(items, deleted=()):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for item in items:
+        yield writer.writerow([
+            item.id, item.subject, item.date, item.start, item.end, item.priority,
+            int(item.completed), int(item.auto_generated), 0,
+        ])
+    for item_id in deleted:
+        yield writer.writerow([item_id, "", "", "", "", "", "", "", 1])
+
+def iter_ics(items, deleted=()):
+    """VCALENDAR หนึ่งชุด เวลาเป็นเวลาท้องถิ่นแบบไม่ระบุเขตเวลา (floating) เหมือนในแอป"""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield "\r\n".join(ICS_HEADER) + "\r\n"
+    for item in items:
+        day = item.date.replace("-", "")
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:{item.id}@{UID_DOMAIN}",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{day}T{item.start.replace(':', '')}00",
+            f"DTEND:{day}T{item.end.replace(':', '')}00",
+            ics_fold(f"SUMMARY:{ics_escape(item.subject)}"),
+            f"PRIORITY:{item.priority}",
+            "STATUS:CONFIRMED",
+            f"{COMPLETED_PROPERTY}:{int(item.completed)}",
+            "END:VEVENT",
+        ]
+        yield "\r\n".join(lines) + "\r\n"
+    for item_id in deleted:
+        yield f"BEGIN:VEVENT\r\nUID:{item_id}@{UID_DOMAIN}\r\nDTSTAMP:{stamp}\r\nSTATUS:CANCELLED\r\nEND:VEVENT\r\n"
+    yield "END:VCALENDAR\r\n"
+
+# รูปแบบ -> (generator, MIME type)
+FORMATS = {
+    "csv": (iter_csv, "text/csv"),
+    "ics": (iter_ics, "text/calendar"),
+}
+
+def export(store, filename, fmt="ics", start_date=None, end_date=None):
+    """เอกสารทั้งตาราง (หรือเฉพาะช่วงวันที่) ทีละชิ้น"""
+    return FORMATS[fmt][0](store.iter_items(filename, start_date, end_date))
+
+def sync(store, filename, fmt="ics", token=None):
+    """(token ใหม่, full, เอกสารทีละชิ้น) ของรายการที่เปลี่ยนหลัง token
+
+    full=True หมายถึงเอกสารมีทั้งตาราง (ครั้งแรก หรือ token เก่าเกินไป) ผู้รับควรแทนที่ของเดิมทั้งหมด
+    """
+    changes = store.changes_since(filename, token)
+    return changes["token"], changes["full"], FORMATS[fmt][0](changes["items"], changes["deleted"])
@@ -0,0 +1,159 @@
+"""ตัวนับและตัวจับเวลาระดับ process สำหรับดูว่าเวลาหมดไปกับส่วนไหน
+
+ค่าเป็นของทั้ง process (ทุก session รวมกัน) ส่งออกเป็น Prometheus text format ได้
+ตั้งอัตราการสุ่มจับเวลาด้วย STUDY_PLANNER_METRICS_SAMPLE (1.0 = ทุกครั้ง, 0.01 = 1%, 0 = ปิดทั้งหมด)
+ครั้งที่ไม่ถูกสุ่มเสียแค่การสุ่มตัวเลขหนึ่งครั้ง จำนวนครั้งที่เรียกจริงประมาณได้จาก (จำนวนที่จับเวลา / อัตราสุ่ม)
+ตัวนับ (count) เช่นจำนวนไบต์นับทุกครั้งเสมอเมื่อเปิดอยู่ ผู้เรียกในจุดที่ถี่มากควรนับรวมเป็นชุด
+ระบุ STUDY_PLANNER_METRICS_FILE เพื่อให้แอปเขียนไฟล์ metrics ทุกครั้งที่รันจบ
+และ STUDY_PLANNER_DEBUG_PANEL=1 เพื่อแสดงแผงข้อมูลประสิทธิภาพใน sidebar
+"""
+from contextlib import contextmanager
+from functools import wraps
+import os
+import random
+import re
+import threading
+import time
+
+SAMPLE_RATE = float(os.environ.get("STUDY_PLANNER_METRICS_SAMPLE", 1.0))
+METRICS_FILE = os.environ.get("STUDY_PLANNER_METRICS_FILE")
+DEBUG_PANEL = os.environ.get("STUDY_PLANNER_DEBUG_PANEL") == "1"
+PREFIX = "study_planner"
+
+def metric_name(name):
+    """ชื่อที่ใช้เป็นชื่อ metric ของ Prometheus ได้ (a-z, 0-9, _)"""
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+class Metrics:
+    def __init__(self, sample_rate=SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self.counters = {}
+        # name -> [จำนวนที่จับเวลา, เวลารวม (วินาที), เวลานานสุด]
+        self.timers = {}
+        self.gauges = {}
+
+    @property
+    def enabled(self):
+        return self.sample_rate > 0
+
+    def _sampled(self):
+        return self.sample_rate >= 1 or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    def count(self, name, value=1):
+        if self.sample_rate <= 0:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set_gauge(self, name, value):
+        if self.sample_rate <= 0:
+            return
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe(self, name, seconds):
+        with self._lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                self.timers[name] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                timer[2] = max(timer[2], seconds)
+
+    @contextmanager
+    def timer(self, name):
+        """จับเวลาบล็อก with ตามอัตราสุ่ม"""
+        if not self._sampled():
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def timed(self, name):
+        """decorator ที่จับเวลาฟังก์ชันตามอัตราสุ่ม (ไม่ผ่าน contextmanager เพื่อให้เบาที่สุด)"""
+        def decorate(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self._sampled():
+                    return func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - started)
+            return wrapper
+        return decorate
+
+    def instrument(self, target, prefix):
+        """ห่อ object ให้ทุก method สาธารณะถูกจับเวลาเป็น "<prefix>.<method>" """
+        return InstrumentedProxy(self, target, prefix)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "timers": {name: list(timer) for name, timer in self.timers.items()},
+                "gauges": dict(self.gauges),
+            }
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.timers.clear()
+            self.gauges.clear()
+
+    def to_prometheus(self):
+        """ค่าทั้งหมดใน Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = f"{PREFIX}_{metric_name(name)}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        lines += [f"# TYPE {PREFIX}_metrics_sample_rate gauge", f"{PREFIX}_metrics_sample_rate {self.sample_rate}"]
+        lines += [
+            f"# HELP {PREFIX}_duration_seconds เวลาที่ใช้ (เฉพาะครั้งที่ถูกสุ่มจับเวลา)",
+            f"# TYPE {PREFIX}_duration_seconds summary",
+        ]
+        for name, (count, total, _) in sorted(snapshot["timers"].items()):
+            lines.append(f'{PREFIX}_duration_seconds_count{{name="{name}"}} {count}')
+            lines.append(f'{PREFIX}_duration_seconds_sum{{name="{name}"}} {total:.6f}')
+        lines += [f"# TYPE {PREFIX}_duration_seconds_max gauge"]
+        lines += [
+            f'{PREFIX}_duration_seconds_max{{name="{name}"}} {timer[2]:.6f}'
+            for name, timer in sorted(snapshot["timers"].items())
+        ]
+        for name, value in sorted(snapshot["gauges"].items()):
+            metric = f"{PREFIX}_{metric_name(name)}"
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, path)
+
+class InstrumentedProxy:
+    def __init__(self, metrics, target, prefix):
+        self._metrics = metrics
+        self._target = target
+        self._prefix = prefix
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name.startswith("_") or not callable(attr) or not self._metrics.enabled:
+            return attr
+        return self._metrics.timed(f"{self._prefix}.{name}")(attr)
+
+    def __setattr__(self, name, value):
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._target, name, value)
+
+metrics = Metrics()
@@ -0,0 +1,588 @@
+"""ตรรกะตารางอ่านหนังสือที่ไม่ขึ้นกับ Streamlit: เวลา ช่วงวันที่ และการตรวจเวลาทับซ้อน"""
+import bisect
+import heapq
+import random
+import uuid
+from datetime import date, datetime, timedelta
+
+from metrics import metrics
+
+COMPLETED = 1
+AUTO_GENERATED = 2
+
+def new_item_id():
+    return uuid.uuid4().hex
+
+def to_minutes(time_str):
+    """แปลง "HH:MM" เป็นจำนวนนาทีนับจากเที่ยงคืน เวลานอกช่วง 00:00-23:59 จะได้ ValueError"""
+    hour, minute = time_str.split(":")
+    hour, minute = int(hour), int(minute)
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"เวลาไม่ถูกต้อง: {time_str!r}")
+    return hour * 60 + minute
+
+def from_minutes(minutes):
+    """แปลงจำนวนนาทีนับจากเที่ยงคืนกลับเป็นรูปแบบ HH:MM"""
+    return f"{minutes // 60 % 24:02d}:{minutes % 60:02d}"
+
+def to_day(date_str):
+    """แปลง "YYYY-MM-DD" เป็นเลข ordinal ของวัน"""
+    return date.fromisoformat(date_str).toordinal()
+
+def from_day(day):
+    """แปลงเลข ordinal ของวันกลับเป็นรูปแบบ YYYY-MM-DD"""
+    return date.fromordinal(day).isoformat()
+
+class ScheduleItem:
+    """รายการอ่านหนังสือหนึ่งช่วงในหน่วยความจำ
+
+    เก็บวันที่เป็น ordinal เวลาเป็นนาทีนับจากเที่ยงคืน และสถานะเป็นบิตใน flags
+    จึงเปรียบเทียบ เรียง และคำนวณความยาวได้โดยไม่ต้อง parse สตริงซ้ำ
+    แปลงจาก/เป็น dict แบบ JSON (from_dict/to_dict) เฉพาะตอนโหลดและบันทึก
+    property date/start/end คืนค่าเป็นสตริงรูปแบบเดิมสำหรับแสดงผล
+    """
+
+    __slots__ = ("id", "subject", "day", "start_minute", "end_minute", "priority", "flags")
+
+    def __init__(self, subject, day, start_minute, end_minute, priority=3,
+                 completed=False, auto_generated=False, item_id=None):
+        self.id = item_id or new_item_id()
+        self.subject = subject
+        self.day = day
+        self.start_minute = start_minute
+        self.end_minute = end_minute
+        self.priority = priority
+        self.flags = (COMPLETED if completed else 0) | (AUTO_GENERATED if auto_generated else 0)
+
+    @classmethod
+    def from_dict(cls, data, strings=None):
+        """สร้างจาก dict ของไฟล์ JSON; strings คือตาราง intern ชื่อวิชาของผู้ใช้คนนั้น"""
+        subject = data["subject"]
+        if strings is not None:
+            subject = strings.setdefault(subject, subject)
+        return cls(
+            subject,
+            to_day(data["date"]),
+            to_minutes(data["start"]),
+            to_minutes(data["end"]),
+            int(data.get("priority", 3)),
+            bool(data.get("completed", False)),
+            bool(data.get("auto_generated", False)),
+            data.get("id"),
+        )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "subject": self.subject,
+            "date": self.date,
+            "start": self.start,
+            "end": self.end,
+            "priority": self.priority,
+            "completed": self.completed,
+            "auto_generated": self.auto_generated,
+        }
+
+    def update(self, changes):
+        """ใส่ค่าที่เปลี่ยนซึ่งใช้ชื่อฟิลด์แบบ JSON เช่น {"completed": True}"""
+        for key, value in changes.items():
+            if key == "date":
+                self.day = to_day(value)
+            elif key == "start":
+                self.start_minute = to_minutes(value)
+            elif key == "end":
+                self.end_minute = to_minutes(value)
+            elif key == "completed":
+                self.completed = value
+            elif key == "auto_generated":
+                self.auto_generated = value
+            elif key in ("id", "subject", "priority"):
+                setattr(self, key, value)
+
+    @property
+    def date(self):
+        return from_day(self.day)
+
+    @property
+    def start(self):
+        return from_minutes(self.start_minute)
+
+    @property
+    def end(self):
+        return from_minutes(self.end_minute)
+
+    @property
+    def minutes(self):
+        """ความยาวเป็นนาที (ช่วงที่ข้ามเที่ยงคืนนับวนรอบ 24 ชั่วโมง)"""
+        return (self.end_minute - self.start_minute) % 1440
+
+    @property
+    def completed(self):
+        return bool(self.flags & COMPLETED)
+
+    @completed.setter
+    def completed(self, value):
+        self.flags = self.flags | COMPLETED if value else self.flags & ~COMPLETED
+
+    @property
+    def auto_generated(self):
+        return bool(self.flags & AUTO_GENERATED)
+
+    @auto_generated.setter
+    def auto_generated(self, value):
+        self.flags = self.flags | AUTO_GENERATED if value else self.flags & ~AUTO_GENERATED
+
+    def copy(self):
+        item = ScheduleItem.__new__(ScheduleItem)
+        for name in self.__slots__:
+            setattr(item, name, getattr(self, name))
+        return item
+
+    def _fields(self):
+        return (self.id, self.subject, self.day, self.start_minute, self.end_minute, self.priority, self.flags)
+
+    def __eq__(self, other):
+        return isinstance(other, ScheduleItem) and self._fields() == other._fields()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ScheduleItem({self.subject!r}, {self.date} {self.start}-{self.end}, priority={self.priority})"
+
+class Schedule(list):
+    """list ของ ScheduleItem ของผู้ใช้หนึ่งคน พร้อมตาราง intern ชื่อวิชา (strings)
+    และแผนที่ id -> ตำแหน่ง (positions) สำหรับหา/ลบรายการตาม id ใน O(1)
+
+    ลำดับใน list ไม่มีความหมาย (ตอนแสดงผลจะเรียงใหม่เสมอ) การลบจึงย้ายรายการสุดท้าย
+    มาแทนที่ ให้แก้ไขผ่าน append/extend/get/remove_id/sort เท่านั้นเพื่อให้แผนที่ตรงเสมอ
+    """
+
+    def __init__(self, items=()):
+        super().__init__()
+        self.strings = {}
+        self.positions = {}
+        # เลขเวอร์ชันของตารางใน store ตอนที่โหลดมา (None = ไม่ได้มาจาก store)
+        self.version = None
+        self.extend(items)
+
+    def intern(self, text):
+        return self.strings.setdefault(text, text)
+
+    @classmethod
+    def from_json(cls, rows):
+        schedule = cls()
+        schedule.extend(ScheduleItem.from_dict(row, schedule.strings) for row in rows)
+        return schedule
+
+    def to_json(self):
+        return [item.to_dict() for item in self]
+
+    def copy(self):
+        """สำเนาของ list และแผนที่ที่ใช้รายการชุดเดิม แก้สำเนาได้โดยไม่กระทบผู้ที่ถือตารางเดิมอยู่
+
+        รายการที่จะแก้ต้องแทนที่ด้วย item.copy() ผ่าน append ไม่ใช่แก้ในที่
+        """
+        schedule = Schedule()
+        list.extend(schedule, self)
+        schedule.strings = dict(self.strings)
+        schedule.positions = dict(self.positions)
+        schedule.version = self.version
+        return schedule
+
+    def append(self, item):
+        """เพิ่มรายการ ถ้ามี id นี้อยู่แล้วจะแทนที่รายการเดิม"""
+        item.subject = self.intern(item.subject)
+        pos = self.positions.get(item.id)
+        if pos is not None:
+            self[pos] = item
+        else:
+            self.positions[item.id] = len(self)
+            super().append(item)
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def get(self, item_id):
+        pos = self.positions.get(item_id)
+        return None if pos is None else self[pos]
+
+    def remove_id(self, item_id):
+        """ลบรายการตาม id แล้วคืนรายการที่ลบ (None ถ้าไม่มี)"""
+        pos = self.positions.pop(item_id, None)
+        if pos is None:
+            return None
+        item = self[pos]
+        last = super().pop()
+        if last is not item:
+            self[pos] = last
+            self.positions[last.id] = pos
+        return item
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self.positions = {item.id: pos for pos, item in enumerate(self)}
+
+def calc_total_hours(schedule):
+    return sum(item.minutes for item in schedule) / 60
+
+def generate_date_range(start_date, end_date):
+    """สร้างรายการวันที่ตั้งแต่วันเริ่มต้นถึงวันสิ้นสุด"""
+    dates = []
+    current_date = start_date
+    while current_date <= end_date:
+        dates.append(current_date)
+        current_date += timedelta(days=1)
+    return dates
+
+class ScheduleIndex:
+    """ดัชนีตารางรายวัน: วัน (ordinal) -> ช่วงเวลา (นาที) ที่เรียงตามเวลาเริ่ม
+
+    สร้างครั้งเดียวต่อการทำงานหนึ่งรอบ แล้วเพิ่ม/ลบรายการตามที่ตารางเปลี่ยน
+    การตรวจเวลาทับซ้อนใช้ bisect จึงเป็น O(log k) ต่อวัน แทนการไล่ทั้งตาราง
+    """
+
+    def __init__(self, schedule=()):
+        # day -> [starts, ends, max_ends, items]
+        self.by_day = {}
+        for item in schedule:
+            self.add(item)
+
+    def add(self, item):
+        starts, ends, max_ends, items = self.by_day.setdefault(item.day, ([], [], [], []))
+        pos = bisect.bisect_right(starts, item.start_minute)
+        starts.insert(pos, item.start_minute)
+        ends.insert(pos, item.end_minute)
+        items.insert(pos, item)
+        max_ends.insert(pos, 0)
+        self._refresh_max_ends(ends, max_ends, pos)
+
+    def remove(self, item):
+        day = self.by_day.get(item.day)
+        if day is None:
+            return False
+        starts, ends, max_ends, items = day
+        pos = bisect.bisect_left(starts, item.start_minute)
+        while pos < len(items) and starts[pos] == item.start_minute:
+            if items[pos] is item:
+                for column in day:
+                    del column[pos]
+                if not items:
+                    del self.by_day[item.day]
+                else:
+                    self._refresh_max_ends(ends, max_ends, pos)
+                return True
+            pos += 1
+        return False
+
+    @staticmethod
+    def _refresh_max_ends(ends, max_ends, pos):
+        running = max_ends[pos - 1] if pos > 0 else 0
+        for i in range(pos, len(ends)):
+            running = max(running, ends[i])
+            max_ends[i] = running
+
+    def has_conflict(self, day, start_minute, end_minute):
+        entry = self.by_day.get(day)
+        if entry is None:
+            return False
+        starts, _, max_ends, _ = entry
+        # รายการที่เริ่มก่อนเวลาสิ้นสุดใหม่ทั้งหมดอยู่ใน starts[:pos]
+        pos = bisect.bisect_left(starts, end_minute)
+        return pos > 0 and max_ends[pos - 1] > start_minute
+
+    def days(self):
+        return sorted(self.by_day)
+
+    def items_on(self, day):
+        entry = self.by_day.get(day)
+        return list(entry[3]) if entry else []
+
+    def intervals_on(self, day):
+        """ช่วงเวลาที่ไม่ว่างของวันนั้นเป็น (เริ่ม, สิ้นสุด) หน่วยนาที เรียงตามเวลาเริ่ม"""
+        entry = self.by_day.get(day)
+        return list(zip(entry[0], entry[1])) if entry else []
+
+@metrics.timed("check_time_conflict")
+def check_time_conflict(schedule, new_date, new_start, new_end):
+    """ตรวจสอบการทับซ้อนของเวลา (รับได้ทั้ง list และ ScheduleIndex)"""
+    new_day = to_day(new_date)
+    new_start_min = to_minutes(new_start)
+    new_end_min = to_minutes(new_end)
+    metrics.count("conflict_checks")
+    if isinstance(schedule, ScheduleIndex):
+        return schedule.has_conflict(new_day, new_start_min, new_end_min)
+    
+    for item in schedule:
+        if item.day == new_day:
+            # ตรวจสอบการทับซ้อน
+            if not (new_end_min <= item.start_minute or new_start_min >= item.end_minute):
+                return True  # มีการทับซ้อน
+    return False
+
+def shift_changes(items, days):
+    """changes (id -> changes) สำหรับเลื่อนรายการทั้งหมดไป days วัน (ติดลบ = เลื่อนถอยหลัง)"""
+    return {item.id: {"date": from_day(item.day + days)} for item in items}
+
+def batch_conflicts(schedule, updates):
+    """ตรวจการทับซ้อนของการแก้ไขทั้งชุด (id -> changes) ก่อนบันทึก คืน list รายการที่จะชน
+
+    schedule ต้องมีทั้งรายการที่ถูกแก้และรายการอื่นในวันปลายทาง รายการที่ย้ายจะเทียบกับ
+    รายการที่ไม่ได้ย้ายและรายการที่ย้ายไปก่อนหน้าในชุดเดียวกัน ด้วยเงื่อนไขเดียวกับ check_time_conflict
+    """
+    moved = {
+        item.id: item for item in schedule
+        if item.id in updates and not updates[item.id].keys().isdisjoint(("date", "start", "end"))
+    }
+    index = ScheduleIndex(item for item in schedule if item.id not in moved)
+    metrics.count("conflict_checks", len(moved))
+    conflicts = []
+    for item_id, item in moved.items():
+        target = ScheduleItem.from_dict({**item.to_dict(), **updates[item_id]})
+        if index.has_conflict(target.day, target.start_minute, target.end_minute):
+            conflicts.append(item)
+        else:
+            index.add(target)
+    return conflicts
+
+# ---------------------- PLANNING ENGINE ----------------------
+DAY_START = "07:00"
+DAY_END = "23:00"
+MAX_SESSION_MINUTES = 120
+MIN_SESSION_MINUTES = 30
+BREAK_MINUTES = 15
+
+def free_intervals(busy, day_start, day_end):
+    """ช่วงว่างภายใน [day_start, day_end) เมื่อหักช่วง busy ที่เรียงตามเวลาเริ่มแล้ว"""
+    free = []
+    cursor = day_start
+    for start, end in busy:
+        if start > cursor:
+            free.append((cursor, min(start, day_end)))
+        cursor = max(cursor, end)
+        if cursor >= day_end:
+            break
+    if cursor < day_end:
+        free.append((cursor, day_end))
+    return [(start, end) for start, end in free if end > start]
+
+def plan_subjects(subjects, existing_schedule=(), start_date=None, day_start=DAY_START, day_end=DAY_END,
+                  max_session_minutes=MAX_SESSION_MINUTES, min_session_minutes=MIN_SESSION_MINUTES,
+                  seed=None, break_minutes=BREAK_MINUTES):
+    """จัดตารางอ่านหลายวิชาพร้อมกันลงในเวลาว่างของแต่ละวัน
+
+    subjects เป็น list ของ dict ที่มี "subject", "exam_date" (date), "total_hours"
+    และอาจมี "priority" (1 = สูงสุด, ค่าเริ่มต้น 3) กับ "hours_per_day" (เพดานต่อวัน)
+
+    แต่ละวันจะแบ่งชั่วโมงที่เหลือของแต่ละวิชาเฉลี่ยตามจำนวนวันก่อนสอบ แล้วจัดลงช่วงว่าง
+    ตามลำดับวันสอบที่ใกล้ที่สุดก่อน (EDF) โดยหยิบช่วงว่างที่เริ่มเร็วที่สุดและยาวพอจาก min-heap
+    ถ้าไม่มีช่วงว่างยาวพอจะแบ่งเป็นหลายช่วง ช่วงที่อ่านครบ max_session_minutes จะเว้นพัก
+    break_minutes ก่อนใช้เวลาที่เหลือของช่วงว่างนั้นต่อ เวลาว่างที่เหลือจะให้วิชาที่ไม่มีเพดานต่อวัน
+    อ่านล่วงหน้าอีกไม่เกินหนึ่งช่วง seed ใช้ตัดสินลำดับวิชาที่วันสอบและความสำคัญเท่ากัน
+
+    คืนค่า (รายการใหม่, ชั่วโมงที่จัดไม่ลงแยกตามวิชา)
+    """
+    if start_date is None:
+        start_date = datetime.now().date()
+    rng = random.Random(seed)
+    index = existing_schedule if isinstance(existing_schedule, ScheduleIndex) else ScheduleIndex(existing_schedule)
+    day_start_min = to_minutes(day_start)
+    day_end_min = to_minutes(day_end)
+
+    tasks = []
+    for subject in subjects:
+        daily = subject.get("hours_per_day")
+        tasks.append({
+            "subject": subject["subject"],
+            "exam_date": subject["exam_date"],
+            "priority": subject.get("priority", 3),
+            "remaining": int(round(subject["total_hours"] * 60)),
+            "daily": int(round(daily * 60)) if daily else None,
+            "tiebreak": rng.random(),
+        })
+
+    items = []
+    current_date = start_date
+    last_date = max((task["exam_date"] for task in tasks), default=start_date)
+    while current_date < last_date:
+        active = [t for t in tasks if t["exam_date"] > current_date and t["remaining"] > 0]
+        if not active:
+            current_date += timedelta(days=1)
+            continue
+        day = current_date.toordinal()
+        free = free_intervals(index.intervals_on(day), day_start_min, day_end_min)
+        heapq.heapify(free)
+        order = sorted(active, key=lambda t: (t["exam_date"], t["priority"], t["tiebreak"]))
+
+        def take_interval(want):
+            """ช่วงว่างแรกที่ยาวพอสำหรับ want นาที ถ้าไม่มีเลยคืนช่วงที่เริ่มเร็วที่สุดแทน"""
+            skipped = []
+            found = None
+            while free:
+                interval = heapq.heappop(free)
+                if interval[1] - interval[0] >= want:
+                    found = interval
+                    break
+                skipped.append(interval)
+            if found is None and skipped:
+                found = skipped.pop(0)
+            for interval in skipped:
+                heapq.heappush(free, interval)
+            return found
+
+        def allocate(task, minutes):
+            while minutes > 0 and free:
+                start, end = take_interval(min(minutes, max_session_minutes))
+                length = end - start
+                if length < min(min_session_minutes, minutes):
+                    continue  # ช่วงสั้นเกินไปสำหรับการอ่านหนึ่งครั้ง ทิ้งไป
+                chunk = min(minutes, length, max_session_minutes)
+                # อ่านครบช่วงยาวสุดแล้วต้องพักก่อน ไม่ต่อช่วงถัดไปทันที
+                rest = start + chunk + (break_minutes if chunk == max_session_minutes else 0)
+                if end - rest > 0:
+                    heapq.heappush(free, (rest, end))
+                item = ScheduleItem(task["subject"], day, start, start + chunk, task["priority"], auto_generated=True)
+                items.append(item)
+                index.add(item)
+                task["remaining"] -= chunk
+                minutes -= chunk
+
+        # รอบแรก: อ่านตามสัดส่วนที่ต้องได้วันนี้ ปัดขึ้นเป็นช่วงละ min_session_minutes
+        for task in order:
+            days_left = (task["exam_date"] - current_date).days
+            target = -(-task["remaining"] // days_left)
+            target = -(-target // min_session_minutes) * min_session_minutes
+            if task["daily"] is not None:
+                target = min(target, task["daily"])
+            allocate(task, min(target, task["remaining"]))
+
+        # รอบสอง: ใช้เวลาว่างที่เหลืออ่านล่วงหน้า วิชาที่สอบก่อนได้ก่อน
+        for task in order:
+            if task["daily"] is None and task["remaining"] > 0:
+                allocate(task, min(max_session_minutes, task["remaining"]))
+
+        current_date += timedelta(days=1)
+
+    unplaced = {t["subject"]: t["remaining"] / 60 for t in tasks if t["remaining"] > 0}
+    return items, unplaced
+
+def schedule_single_subject(subject_name, exam_date, hours_per_day, existing_schedule=(), start_date=None, seed=None):
+    """จัดตารางวิชาเดียว อ่านวันละ hours_per_day ทุกวันจนถึงวันก่อนสอบ หลีกเลี่ยงเวลาทับซ้อน
+
+    แบ่งเป็นหลายช่วงได้ถ้าไม่มีช่วงว่างยาวพอ คืน list ของรายการใหม่ (ว่างถ้าวันสอบไม่อยู่หลัง start_date)
+    """
+    if start_date is None:
+        start_date = datetime.now().date()
+    days_available = (exam_date - start_date).days
+    if days_available <= 0:
+        return []
+    schedule_items, _ = plan_subjects(
+        [{
+            "subject": subject_name,
+            "exam_date": exam_date,
+            "total_hours": hours_per_day * days_available,
+            "hours_per_day": hours_per_day,
+        }],
+        existing_schedule,
+        start_date=start_date,
+        seed=seed,
+    )
+    return schedule_items
+
+@metrics.timed("auto_schedule_subject")
+def auto_schedule_subject(store, filename, subject_name, exam_date, hours_per_day, start_date=None, seed=None):
+    """จัดสรรตารางอ่านแบบอัตโนมัติโดยหลีกเลี่ยงเวลาทับซ้อน (ผู้เรียกต้อง store.add เอง)"""
+    if start_date is None:
+        start_date = datetime.now().date()
+
+    # โหลดเฉพาะรายการที่อยู่ในช่วงวันที่จะจัดตาราง
+    existing_schedule = store.items_between(
+        filename, start_date.strftime("%Y-%m-%d"), exam_date.strftime("%Y-%m-%d")
+    )
+    return schedule_single_subject(subject_name, exam_date, hours_per_day, existing_schedule, start_date, seed)
+
+def plan_manual_items(existing_schedule, subject, start_date, end_date, start_minute, end_minute, priority=3):
+    """รายการเวลาเดียวกันทุกวันตั้งแต่ start_date ถึง end_date ข้ามวันที่ทับซ้อนกับตารางเดิม
+
+    คืนค่า (รายการใหม่, list ของวันที่ที่ทับซ้อนเป็น "YYYY-MM-DD")
+    """
+    index = existing_schedule if isinstance(existing_schedule, ScheduleIndex) else ScheduleIndex(existing_schedule)
+    new_items = []
+    conflicts = []
+    dates = generate_date_range(start_date, end_date)
+    metrics.count("conflict_checks", len(dates))
+    for single_date in dates:
+        day = single_date.toordinal()
+        if index.has_conflict(day, start_minute, end_minute):
+            conflicts.append(single_date.strftime("%Y-%m-%d"))
+        else:
+            item = ScheduleItem(subject, day, start_minute, end_minute, priority)
+            index.add(item)
+            new_items.append(item)
+    return new_items, conflicts
+
+# ---------------------- STATISTICS ----------------------
+STATS_DIMENSIONS = ("total", "date", "subject", "priority")
+
+class ScheduleStats:
+    """สถิติสะสมของตาราง ปรับตามการเพิ่ม/แก้ไข/ลบทีละรายการใน O(1)
+
+    groups[dimension][key] = [จำนวนรายการ, จำนวนที่อ่านจบ, นาทีรวม, นาทีที่อ่านจบ]
+    dimension คือ "total" (key ว่าง), "date", "subject" และ "priority" (key เป็นสตริง)
+    การแก้ไขรายการทำได้ด้วย remove(ค่าเดิม) แล้ว add(ค่าใหม่)
+    """
+
+    def __init__(self, groups=None):
+        self.groups = groups if groups is not None else {dimension: {} for dimension in STATS_DIMENSIONS}
+
+    @classmethod
+    def from_schedule(cls, schedule):
+        stats = cls()
+        for item in schedule:
+            stats.add(item)
+        return stats
+
+    @staticmethod
+    def item_rows(item):
+        """ค่าที่รายการนี้ส่งผลต่อแต่ละกลุ่ม เป็น (dimension, key, ค่า 4 ช่อง)"""
+        minutes = item.minutes
+        done = item.flags & COMPLETED
+        values = (1, done, minutes, minutes * done)
+        return [
+            ("total", "", values),
+            ("date", item.date, values),
+            ("subject", item.subject, values),
+            ("priority", str(item.priority), values),
+        ]
+
+    def add(self, item, sign=1):
+        for dimension, key, values in self.item_rows(item):
+            group = self.groups.setdefault(dimension, {})
+            row = group.setdefault(key, [0, 0, 0, 0])
+            for i, value in enumerate(values):
+                row[i] += sign * value
+            if row[0] <= 0:
+                del group[key]
+
+    def remove(self, item):
+        self.add(item, -1)
+
+    def __eq__(self, other):
+        return isinstance(other, ScheduleStats) and self.groups == other.groups
+
+    def summary(self):
+        total = self.groups["total"].get("", [0, 0, 0, 0])
+        dates = self.groups["date"]
+        return {
+            "total_hours": total[2] / 60,
+            "completed_count": total[1],
+            "total_count": total[0],
+            "first_date": min(dates, default=None),
+            "last_date": max(dates, default=None),
+            "date_hours": {date: row[2] / 60 for date, row in dates.items()},
+            "subject_hours": {
+                subject: {"hours": row[2] / 60, "completed_hours": row[3] / 60}
+                for subject, row in self.groups["subject"].items()
+            },
+            "priority_counts": {int(priority): row[0] for priority, row in self.groups["priority"].items()},
+        }
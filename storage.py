@@ -0,0 +1,1108 @@
+"""ที่เก็บข้อมูลผู้ใช้และตารางอ่านหนังสือ
+
+เลือก backend ด้วยตัวแปรแวดล้อม STUDY_PLANNER_STORAGE
+- "json" (ค่าเริ่มต้น): เขียนทับทั้งไฟล์ data_<email>.json ทุกครั้งที่มีการเปลี่ยนแปลง
+- "journal": ต่อท้ายบันทึกการเปลี่ยนแปลงลงไฟล์ .log แล้วค่อยรวมเป็น snapshot
+  เมื่อไฟล์ log ใหญ่เกินเกณฑ์ ทำให้การบันทึกหนึ่งครั้งไม่ขึ้นกับขนาดตาราง
+- "sqlite": เก็บผู้ใช้และรายการทั้งหมดในฐานข้อมูลเดียว (STUDY_PLANNER_DB)
+  และ query เฉพาะแถวที่ต้องใช้ผ่าน index
+
+ทุก backend ระบุตารางของผู้ใช้ด้วยชื่อไฟล์ data_<email>.json เหมือนเดิม
+(SQLite ใช้ค่านี้เป็นคอลัมน์ owner) จึงย้ายข้อมูลระหว่าง backend ได้ตรง ๆ
+
+การเขียนพร้อมกันจากหลาย session/process:
+- โหมดไฟล์ล็อก <ไฟล์>.lock ด้วย fcntl.flock ระหว่างอ่าน-แก้-เขียน และอ่านสถานะล่าสุดจากดิสก์
+  ภายใต้ล็อกเสมอ add/update/delete ตาม id จึงรวมกับการแก้ของ session อื่นได้โดยไม่ทับกัน
+- SQLite ใช้ transaction แบบ BEGIN IMMEDIATE
+- ทุกตารางมีเลขเวอร์ชันที่เพิ่มทุกครั้งที่เขียน save() ทั้งตารางจาก Schedule ที่โหลดมา
+  ก่อนเวอร์ชันปัจจุบันจะได้ StaleWriteError แทนการเขียนทับ ใช้ modify() เพื่อโหลดใหม่และลองซ้ำ
+
+ย้ายข้อมูลจากไฟล์ JSON เข้า SQLite:
+    python storage.py migrate --db study_planner.db --dir .
+
+ย้าย users_database.json เข้า shard ล่วงหน้า (ปกติจะย้ายเองตอนใช้งานครั้งแรก):
+    python storage.py migrate-users --dir .
+
+ทดสอบการเขียนพร้อมกันหลาย process (ไม่ควรมีการแก้ไขหาย):
+    python stress_test.py --dir /tmp/stress --workers 8 --rounds 50
+
+การซิงก์แบบเพิ่มทีละส่วน: changes_since(filename, token) คืนเฉพาะรายการที่เพิ่ม/แก้/ลบหลัง token
+พร้อม token ใหม่ (token None หรือใช้ไม่ได้แล้วจะได้ทั้งตารางพร้อม full=True)
+- โหมดไฟล์ต่อท้าย <ไฟล์>.changes ทุกครั้งที่เขียน token เก็บตำแหน่งในไฟล์ จึงอ่านเฉพาะส่วนที่เปลี่ยน
+  ไฟล์นี้เริ่มเมื่อมีการขอ token ครั้งแรก และเริ่มใหม่เมื่อใหญ่เกิน CHANGES_MAX_BYTES
+- SQLite เก็บเวอร์ชันล่าสุดที่แต่ละรายการเปลี่ยน (รวมรายการที่ถูกลบ) ในตาราง schedule_changes
+"""
+from collections import OrderedDict
+from contextlib import contextmanager
+import glob
+import hashlib
+import json
+from operator import attrgetter
+import os
+import sqlite3
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: ไม่มี advisory lock ใช้ได้แค่ล็อกภายใน process
+    fcntl = None
+
+from metrics import metrics
+from scheduling import Schedule, ScheduleItem, ScheduleStats, new_item_id, to_day
+
+USERS_FILENAME = "users_database.json"
+USERS_DIRNAME = "users"
+USER_SHARD_HEX_DIGITS = 3
+USER_CACHE_MAX_ENTRIES = 1024
+USER_SHARD_CACHE_MAX_ENTRIES = 256
+COMPACT_BYTES = 256 * 1024
+DEFAULT_DB = "study_planner.db"
+CACHE_MAX_ENTRIES = 128
+MODIFY_RETRIES = 5
+CHANGES_MAX_BYTES = 1024 * 1024
+
+class StaleWriteError(RuntimeError):
+    """ตารางถูกบันทึกโดย session อื่นหลังจากที่โหลดมา"""
+
+def sort_schedule(schedule):
+    schedule.sort(key=attrgetter("day", "start_minute", "priority"))
+    return schedule
+
+def parse_token(token):
+    """แยก token ที่ changes_since คืนให้เป็น list ของจำนวนเต็ม/สตริง คืน None ถ้าผิดรูปแบบ"""
+    try:
+        return [part if i == 0 else int(part) for i, part in enumerate(token.split("."))]
+    except (AttributeError, ValueError):
+        return None
+
+def read_schedule(filename):
+    """อ่านไฟล์ตารางเป็น Schedule คืนค่า (schedule, มีรายการเก่าที่เพิ่งได้ id หรือไม่)"""
+    rows = read_json(filename, [])
+    return Schedule.from_json(rows), any(not row.get("id") for row in rows)
+
+def read_json(filename, default):
+    if os.path.exists(filename):
+        with open(filename, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            metrics.count("bytes_read", os.fstat(f.fileno()).st_size)
+        return data
+    return default
+
+def write_json_atomic(filename, data):
+    """เขียนลงไฟล์ชั่วคราวแล้วสลับแทนที่ ไฟล์เดิมจึงไม่เสียถ้าโปรแกรมล่มกลางทาง"""
+    tmp = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+        metrics.count("bytes_written", os.fstat(f.fileno()).st_size)
+    os.replace(tmp, filename)
+
+def file_signature(*paths):
+    """(mtime_ns, size, inode) ของแต่ละไฟล์ ใช้ตรวจว่าข้อมูลในแคชยังตรงกับบนดิสก์
+
+    การเขียนแบบ atomic ได้ inode ใหม่ทุกครั้ง จึงแยกการเขียนสองครั้งที่ขนาดเท่ากัน
+    ในช่วงความละเอียดของ mtime เดียวกันได้
+    """
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            signature.append(None)
+        else:
+            signature.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+    return tuple(signature)
+
+_process_locks = {}
+_process_locks_guard = threading.Lock()
+_held_locks = threading.local()
+_state_locks = {}
+
+@contextmanager
+def file_lock(path):
+    """ล็อกแบบ exclusive ของ path ข้าม thread และ process (ผ่านไฟล์ <path>.lock)
+
+    ซ้อนกันได้ใน thread เดียวกัน ล็อกชั้นในจะไม่ทำอะไร
+    """
+    held = getattr(_held_locks, "paths", None)
+    if held is None:
+        held = _held_locks.paths = set()
+    if path in held:
+        yield
+        return
+    with _process_locks_guard:
+        process_lock = _process_locks.setdefault(path, threading.Lock())
+    with process_lock, open(f"{path}.lock", "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        held.add(path)
+        try:
+            yield
+        finally:
+            held.discard(path)
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def state_lock(path):
+    """ล็อกภายใน process ของสถานะในแคชของ path (ไม่ครอบการอ่าน/เขียนไฟล์)
+
+    ผู้เขียนถือ file_lock อยู่แล้ว และถือล็อกนี้เฉพาะตอนแก้ schedule/stats ในแคชซึ่งเป็น O(จำนวนที่แก้)
+    ผู้อ่านถือล็อกนี้ระหว่างสร้างสำเนา/สรุปจากแคช จึงไม่เห็น dict หรือ list ที่กำลังถูกแก้
+    """
+    with _process_locks_guard:
+        return _state_locks.setdefault(path, threading.Lock())
+
+class LoadCache:
+    """แคช LRU ระดับ process ของข้อมูลที่ parse แล้ว คีย์ด้วย path ของไฟล์
+
+    Streamlit รันสคริปต์ใหม่ทุกครั้งที่มีการคลิก แคชนี้ทำให้ไม่ต้อง decode JSON ซ้ำ
+    ถ้าไฟล์ไม่เปลี่ยน ค่าที่คืนเป็นออบเจกต์ที่ใช้ร่วมกัน ห้ามแก้ไขโดยไม่บันทึกผ่าน store
+    store แก้ตารางในแคชภายใต้ state_lock ผู้อ่านที่วนซ้ำต้องถือล็อกเดียวกัน
+    """
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, signature):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != signature:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, signature, value):
+        with self._lock:
+            self._entries[key] = (signature, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+load_cache = LoadCache()
+# ผู้ใช้ที่เพิ่งอ่าน/เข้าสู่ระบบ คีย์ด้วยอีเมล ตรวจความสดด้วย signature ของไฟล์ shard
+user_cache = LoadCache(USER_CACHE_MAX_ENTRIES)
+# ไฟล์ shard ที่ parse แล้ว แยกจาก load_cache การเข้าสู่ระบบของผู้ใช้ใหม่ ๆ จึงไม่ดันตารางออกจากแคช
+shard_cache = LoadCache(USER_SHARD_CACHE_MAX_ENTRIES)
+
+class JsonStore:
+    """เขียนทับทั้งไฟล์ทุกครั้งที่มีการเปลี่ยนแปลง (พฤติกรรมเดิม)
+
+    add/update/delete ทำงานกับไฟล์โดยตรงตาม id ผู้เรียกต้องแก้ไขรายการ
+    ที่ถืออยู่ในหน่วยความจำเองถ้ายังต้องใช้ต่อ
+
+    สถิติ (ScheduleStats) และเลขเวอร์ชันเก็บคู่กับตารางในไฟล์ <data>.stats และในแคช
+    ทุกการแก้ไขปรับสถิติทีละรายการ ไม่ต้องคำนวณใหม่ทั้งตาราง
+    การแก้ไขปรับ schedule/stats ในแคชภายใต้ state_lock โดยแทนที่รายการที่แก้ด้วยสำเนา (item.copy())
+    รายการที่ผู้อ่านได้ไปแล้วจึงไม่เปลี่ยนภายหลัง และผู้อ่านที่ถือล็อกเดียวกันไม่เห็นสถานะครึ่ง ๆ กลาง ๆ
+    """
+
+    users_filename = USERS_FILENAME
+
+    # ---- ผู้ใช้ ----
+    # ผู้ใช้กระจายอยู่ในไฟล์ shard ตาม hash ของอีเมล (users/<hex>.json) การเข้าสู่ระบบหรือสมัคร
+    # อ่าน/เขียนแค่ shard เดียว ไม่ขึ้นกับจำนวนผู้ใช้ทั้งหมด users_database.json เดิม
+    # จะถูกย้ายเข้า shard อัตโนมัติครั้งแรกที่ใช้งาน แล้วเปลี่ยนชื่อเป็น .migrated
+    @property
+    def users_dir(self):
+        return os.path.join(os.path.dirname(self.users_filename), USERS_DIRNAME)
+
+    def user_shard(self, email):
+        digest = hashlib.sha256(email.encode("utf-8")).hexdigest()
+        return os.path.join(self.users_dir, f"{digest[:USER_SHARD_HEX_DIGITS]}.json")
+
+    def _load_shard(self, shard):
+        signature = file_signature(shard)
+        users = shard_cache.get(shard, signature)
+        if users is None:
+            users = read_json(shard, {})
+            shard_cache.put(shard, signature, users)
+        return users, signature
+
+    def _migrate_legacy_users(self):
+        """ย้ายผู้ใช้จากไฟล์เดียวแบบเดิมเข้า shard (ผู้ใช้ที่มีใน shard แล้วไม่ถูกทับ)"""
+        if not os.path.exists(self.users_filename):
+            return
+        with file_lock(self.users_filename):
+            if not os.path.exists(self.users_filename):
+                return
+            self._write_users(read_json(self.users_filename, {}), overwrite=False)
+            os.replace(self.users_filename, f"{self.users_filename}.migrated")
+
+    def _write_users(self, users, overwrite=True):
+        by_shard = {}
+        for email, record in users.items():
+            by_shard.setdefault(self.user_shard(email), {})[email] = record
+        os.makedirs(self.users_dir, exist_ok=True)
+        for shard, records in by_shard.items():
+            with file_lock(shard):
+                shard_users = dict(self._load_shard(shard)[0])
+                for email, record in records.items():
+                    if overwrite or email not in shard_users:
+                        shard_users[email] = record
+                write_json_atomic(shard, shard_users)
+                shard_cache.put(shard, file_signature(shard), shard_users)
+
+    def load_users(self):
+        """ผู้ใช้ทั้งหมด (อ่านทุก shard ใช้กับงานย้าย/ดูแลระบบ ไม่ใช่ตอนเข้าสู่ระบบ)"""
+        self._migrate_legacy_users()
+        users = {}
+        for shard in sorted(glob.glob(os.path.join(self.users_dir, "*.json"))):
+            users.update(self._load_shard(shard)[0])
+        return users
+
+    def save_users(self, users):
+        """เพิ่ม/แทนที่ผู้ใช้ตามที่ให้มา ผู้ใช้อื่นใน shard เดิมยังอยู่"""
+        self._migrate_legacy_users()
+        self._write_users(users)
+
+    def get_user(self, email):
+        self._migrate_legacy_users()
+        shard = self.user_shard(email)
+        signature = file_signature(shard)
+        record = user_cache.get(email, signature)
+        if record is None:
+            record = self._load_shard(shard)[0].get(email)
+            if record is not None:
+                user_cache.put(email, signature, record)
+        return record
+
+    def update_user(self, email, record):
+        self.save_users({email: record})
+
+    def create_user(self, email, record):
+        self._migrate_legacy_users()
+        shard = self.user_shard(email)
+        os.makedirs(self.users_dir, exist_ok=True)
+        with file_lock(shard):
+            if email in self._load_shard(shard)[0]:
+                return False
+            self._write_users({email: record})
+        return True
+
+    # ---- ตาราง ----
+    @staticmethod
+    def stats_filename(filename):
+        return f"{filename}.stats"
+
+    def _signature(self, filename):
+        return file_signature(filename)
+
+    def _state(self, filename):
+        """(schedule, stats) จากแคช หรืออ่านจากดิสก์ถ้าไฟล์เปลี่ยนไปแล้ว"""
+        signature = self._signature(filename)
+        state = load_cache.get(filename, signature)
+        if state is None:
+            # อ่านจากดิสก์ภายใต้ล็อก เพราะอาจต้องเขียน id ที่เติมหรือตัด log ที่ไม่ครบ
+            with file_lock(filename):
+                signature = self._signature(filename)
+                state = self._read_state(filename, signature)
+        return state
+
+    def _read_state(self, filename, signature):
+        schedule, backfilled = read_schedule(filename)
+        stats, schedule.version = self._read_stats(filename, schedule)
+        state = (schedule, stats)
+        if backfilled:
+            # บันทึก id ที่เพิ่งเติมทันที ให้ id คงเดิมทุกครั้งที่โหลด
+            self._write(filename, *state)
+        else:
+            load_cache.put(filename, signature, state)
+        return state
+
+    def _read_stats(self, filename, schedule):
+        """(สถิติ, เวอร์ชัน) ใช้สถิติในไฟล์ถ้าเขียนคู่กับ snapshot ปัจจุบัน ไม่เช่นนั้นคำนวณใหม่จาก schedule"""
+        stored = read_json(self.stats_filename(filename), None)
+        if stored is None:
+            return ScheduleStats.from_schedule(schedule), 0
+        snapshot = file_signature(filename)[0]
+        version = stored.get("version", 0)
+        if snapshot is not None and stored.get("snapshot") == list(snapshot):
+            return ScheduleStats(stored["groups"]), version
+        return ScheduleStats.from_schedule(schedule), version
+
+    def _write_snapshot(self, filename, schedule, stats):
+        write_json_atomic(filename, schedule.to_json())
+        snapshot = file_signature(filename)[0]
+        write_json_atomic(
+            self.stats_filename(filename),
+            {"snapshot": snapshot, "version": schedule.version, "groups": stats.groups},
+        )
+
+    def _write(self, filename, schedule, stats):
+        self._write_snapshot(filename, schedule, stats)
+        load_cache.put(filename, self._signature(filename), (schedule, stats))
+
+    def load(self, filename):
+        """สำเนาของตารางทั้งหมด (ใช้รายการชุดเดียวกับในแคช ห้ามแก้รายการในที่)"""
+        schedule = self._state(filename)[0]
+        with state_lock(filename):
+            return schedule.copy()
+
+    def version(self, filename):
+        return self._state(filename)[0].version
+
+    def save(self, filename, schedule):
+        """เขียนทับทั้งตาราง ถ้า schedule โหลดมาก่อนเวอร์ชันปัจจุบันจะได้ StaleWriteError"""
+        with file_lock(filename):
+            previous = self._state(filename)[0]
+            loaded_version = getattr(schedule, "version", None)
+            if loaded_version is not None and loaded_version != previous.version:
+                raise StaleWriteError(filename)
+            schedule = Schedule(schedule)
+            schedule.version = previous.version + 1
+            self._write(filename, schedule, ScheduleStats.from_schedule(schedule))
+            # generator เทียบกับตารางเดิม คำนวณเฉพาะเมื่อมีไฟล์ .changes รายการที่เป็นออบเจกต์
+            # เดียวกับในแคชอาจถูกแก้ในที่ (in place) มาแล้ว จึงนับว่าเปลี่ยนไว้ก่อน
+            self._log_changes(
+                filename, previous.version, schedule.version,
+                (item.id for item in schedule if previous.get(item.id) is item or previous.get(item.id) != item),
+                (item_id for item_id in previous.positions if item_id not in schedule.positions),
+            )
+
+    def modify(self, filename, func, retries=MODIFY_RETRIES):
+        """โหลด-แก้-บันทึกทั้งตารางแบบ optimistic โดยไม่ถือล็อกระหว่างเรียก func(schedule)
+
+        ถ้ามี session อื่นบันทึกก่อน จะโหลดสถานะล่าสุดแล้วเรียก func ใหม่ สูงสุด retries ครั้ง
+        """
+        for attempt in range(retries):
+            loaded = self.load(filename)
+            draft = Schedule(ScheduleItem.from_dict(item.to_dict()) for item in loaded)
+            draft.version = loaded.version
+            func(draft)
+            try:
+                self.save(filename, draft)
+                return
+            except StaleWriteError:
+                if attempt == retries - 1:
+                    raise
+
+    def add(self, filename, items):
+        with file_lock(filename):
+            schedule, stats = self._state(filename)
+            with state_lock(filename):
+                for item in items:
+                    schedule.append(item)
+                    stats.add(item)
+                schedule.version += 1
+            self._write(filename, schedule, stats)
+            self._log_changes(filename, schedule.version - 1, schedule.version, (item.id for item in items))
+
+    def update(self, filename, item_id, **changes):
+        self.update_many(filename, {item_id: changes})
+
+    def delete(self, filename, item_id):
+        self.delete_many(filename, [item_id])
+
+    def update_many(self, filename, updates):
+        """ใช้ updates (id -> changes) ทั้งชุดแล้วบันทึกครั้งเดียว id ที่ไม่มีอยู่จะถูกข้าม ไม่มีอะไรเปลี่ยน = ไม่เขียน"""
+        with file_lock(filename):
+            schedule, stats = self._state(filename)
+            changed = []
+            with state_lock(filename):
+                for item_id, changes in updates.items():
+                    item = schedule.get(item_id)
+                    if item is not None:
+                        stats.remove(item)
+                        item = item.copy()
+                        item.update(changes)
+                        schedule.append(item)
+                        stats.add(item)
+                        changed.append(item_id)
+                if not changed:
+                    return
+                schedule.version += 1
+            self._write(filename, schedule, stats)
+            self._log_changes(filename, schedule.version - 1, schedule.version, changed)
+
+    def delete_many(self, filename, item_ids):
+        with file_lock(filename):
+            schedule, stats = self._state(filename)
+            deleted = []
+            with state_lock(filename):
+                for item_id in item_ids:
+                    item = schedule.remove_id(item_id)
+                    if item is not None:
+                        stats.remove(item)
+                        deleted.append(item_id)
+                if not deleted:
+                    return
+                schedule.version += 1
+            self._write(filename, schedule, stats)
+            self._log_changes(filename, schedule.version - 1, schedule.version, (), deleted)
+
+    # ---- query ----
+    def items_between(self, filename, start_date=None, end_date=None, subject=None):
+        """รายการที่วันที่อยู่ในช่วง [start_date, end_date] (None = ไม่จำกัด) เรียงตามวัน เวลา ความสำคัญ
+
+        ระบุ subject เพื่อเอาเฉพาะรายการของวิชานั้น
+        """
+        start_day = to_day(start_date) if start_date is not None else None
+        end_day = to_day(end_date) if end_date is not None else None
+        schedule = self._state(filename)[0]
+        with state_lock(filename):
+            items = [
+                item for item in schedule
+                if (start_day is None or item.day >= start_day)
+                and (end_day is None or item.day <= end_day)
+                and (subject is None or item.subject == subject)
+            ]
+        return sort_schedule(items)
+
+    def iter_items(self, filename, start_date=None, end_date=None):
+        """รายการในช่วงทีละรายการ เรียงเหมือน items_between
+
+        โหมดไฟล์มีทั้งตารางในแคชอยู่แล้ว และต้องเรียงรายการในช่วงเป็น list ก่อน (O(N) ตัวอ้างอิง)
+        การส่งออกที่ใช้หน่วยความจำคงที่มีเฉพาะ SqliteStore ที่อ่านจาก cursor
+        """
+        yield from self.items_between(filename, start_date, end_date)
+
+    def stats(self, filename):
+        stats = self._state(filename)[1]
+        with state_lock(filename):
+            return stats.summary()
+
+    def verify_stats(self, filename):
+        """คำนวณสถิติใหม่ทั้งหมดเทียบกับที่เก็บไว้ ถ้าไม่ตรงจะแทนที่ด้วยค่าใหม่ คืนค่า True ถ้าตรง"""
+        with file_lock(filename):
+            schedule, stats = self._state(filename)
+            fresh = ScheduleStats.from_schedule(schedule)
+            if fresh == stats:
+                return True
+            self._write(filename, schedule, fresh)
+        return False
+
+    # ---- การซิงก์ ----
+    # <data>.changes บรรทัดแรกคือ {"generation", "version"} ที่เริ่มบันทึก บรรทัดต่อไปคือการเขียน
+    # หนึ่งครั้ง {"from", "version", "changed", "deleted"} token คือ "<generation>.<version>.<offset>"
+    # โดย offset เป็นตำแหน่งท้ายบรรทัดของเวอร์ชันนั้น การซิงก์ครั้งถัดไปจึงอ่านต่อจาก offset เท่านั้น
+    @staticmethod
+    def changes_filename(filename):
+        return f"{filename}.changes"
+
+    def _log_changes(self, filename, from_version, version, changed=(), deleted=()):
+        """ต่อท้ายการเปลี่ยนแปลงของการเขียนครั้งนี้ (ต้องถือล็อกของไฟล์อยู่)
+
+        ตารางที่ยังไม่เคยขอ token ไม่มีไฟล์ .changes จึงไม่เสียการเขียนเพิ่ม
+        """
+        path = self.changes_filename(filename)
+        if not os.path.exists(path):
+            return
+        if os.path.getsize(path) >= CHANGES_MAX_BYTES:
+            # token เดิมทั้งหมดจะได้ทั้งตาราง แล้วเริ่มไฟล์ใหม่ในการซิงก์ครั้งถัดไป
+            os.remove(path)
+            return
+        entry = {"from": from_version, "version": version, "changed": list(changed), "deleted": list(deleted)}
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        with open(path, "ab") as f:
+            f.write(line)
+        metrics.count("bytes_written", len(line))
+
+    @staticmethod
+    def _scan_changes(path, offset, version):
+        """อ่าน .changes จาก offset ที่ต่อจาก version คืน (changed, deleted, เวอร์ชันล่าสุด, offset ท้าย)
+
+        คืน None ถ้าเวอร์ชันไม่ต่อเนื่องหรือมีบรรทัดเสีย (เช่นล่มระหว่างเขียน)
+        """
+        changed, deleted = set(), set()
+        with open(path, "rb") as f:
+            if offset > os.fstat(f.fileno()).st_size:
+                return None
+            f.seek(offset)
+            for line in f:
+                try:
+                    entry = json.loads(line) if line.endswith(b"\n") else None
+                except ValueError:
+                    entry = None
+                if entry is None or entry.get("from") != version:
+                    return None
+                changed.difference_update(entry["deleted"])
+                changed.update(entry["changed"])
+                deleted.difference_update(entry["changed"])
+                deleted.update(entry["deleted"])
+                version = entry["version"]
+                offset += len(line)
+        metrics.count("bytes_read", offset)
+        return changed, deleted, version, offset
+
+    @staticmethod
+    def _changes_header(path):
+        try:
+            with open(path, "rb") as f:
+                line = f.readline()
+            header = json.loads(line)
+            return header["generation"], header["version"], len(line)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def changes_since(self, filename, token=None):
+        """รายการที่เปลี่ยนหลัง token คืน dict {"token", "full", "items", "deleted"}
+
+        items เรียงตามวัน เวลา ความสำคัญ deleted คือ id ที่ถูกลบ
+        full=True หมายถึง items คือทั้งตาราง (token เป็น None, เก่าเกินไป หรือใช้ไม่ได้)
+        """
+        with file_lock(filename):
+            # ภายใต้ file_lock ไม่มีผู้เขียนแก้ตารางในแคช จึงอ่านได้โดยไม่ต้องทำสำเนา
+            schedule = self._state(filename)[0]
+            path = self.changes_filename(filename)
+            header = self._changes_header(path)
+            scan = None
+            full = True
+            if header is not None:
+                generation, base_version, header_end = header
+                parsed = parse_token(token)
+                if parsed is not None and len(parsed) == 3 and parsed[0] == generation:
+                    scan = self._scan_changes(path, parsed[2], parsed[1])
+                    full = False
+                if scan is None or scan[2] != schedule.version:
+                    scan = self._scan_changes(path, header_end, base_version)
+                    full = True
+            if scan is None or scan[2] != schedule.version:
+                # ยังไม่เคยบันทึก หรือบันทึกขาดช่วง: เริ่มรุ่นใหม่ที่เวอร์ชันปัจจุบัน
+                generation = new_item_id()
+                line = json.dumps({"generation": generation, "version": schedule.version}) + "\n"
+                tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(line)
+                os.replace(tmp, path)
+                scan = (set(), set(), schedule.version, len(line.encode("utf-8")))
+            changed, deleted, version, offset = scan
+            result = {"token": f"{generation}.{version}.{offset}", "full": full}
+            if full:
+                result["items"] = sort_schedule(list(schedule))
+                result["deleted"] = []
+            else:
+                result["items"] = sort_schedule([schedule.get(i) for i in changed if i in schedule.positions])
+                result["deleted"] = sorted(deleted | {i for i in changed if i not in schedule.positions})
+        return result
+
+class JournalStore(JsonStore):
+    """snapshot (ไฟล์ JSON เดิม) + log แบบต่อท้ายของ add/update/delete ตาม id
+
+    ตอนโหลดจะอ่าน snapshot แล้วเล่น log ซ้ำ ทุกคำสั่งใน log เป็นการกำหนดสถานะ
+    ของรายการตาม id จึงเล่นซ้ำบน snapshot ที่รวม log ไปแล้วได้ผลเหมือนเดิม
+    ถ้าล่มระหว่างเขียนบรรทัดสุดท้าย บรรทัดที่ไม่ครบจะถูกตัดทิ้งตอนโหลดครั้งถัดไป
+    ไฟล์สถิติเขียนเฉพาะตอนรวม snapshot และปรับตาม log ระหว่างเล่นซ้ำ
+    """
+
+    def __init__(self, compact_bytes=COMPACT_BYTES):
+        self.compact_bytes = compact_bytes
+
+    @staticmethod
+    def log_filename(filename):
+        return f"{filename}.log"
+
+    def _signature(self, filename):
+        return file_signature(filename, self.log_filename(filename))
+
+    def _read_state(self, filename, signature):
+        schedule, backfilled = read_schedule(filename)
+        stats, schedule.version = self._read_stats(filename, schedule)
+        if signature[1] is not None:
+            # ทุกบรรทัดใน log คือการเขียนหนึ่งครั้ง
+            for record in self._read_log(self.log_filename(filename)):
+                self._apply(schedule, stats, record)
+                schedule.version += 1
+        if backfilled:
+            # id ที่เพิ่งเติมต้องลง snapshot ก่อน ไม่เช่นนั้น log จะอ้างถึง id ที่หายไป
+            self._write(filename, schedule, stats)
+        else:
+            load_cache.put(filename, signature, (schedule, stats))
+        return schedule, stats
+
+    @staticmethod
+    def _read_log(log_file):
+        records = []
+        valid_bytes = 0
+        with open(log_file, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                valid_bytes += len(line)
+        metrics.count("bytes_read", valid_bytes)
+        if valid_bytes != os.path.getsize(log_file):
+            # บรรทัดท้ายเขียนไม่ครบจากการล่ม ตัดทิ้งเพื่อให้ต่อท้ายครั้งถัดไปได้ถูกต้อง
+            with open(log_file, "r+b") as f:
+                f.truncate(valid_bytes)
+        return records
+
+    @staticmethod
+    def _apply(schedule, stats, record):
+        """ใช้บันทึกหนึ่งรายการกับ schedule และ stats (ทั้งตอนเล่นซ้ำและตอนปรับแคช)"""
+        op = record["op"]
+        if op == "add":
+            item = ScheduleItem.from_dict(record["item"], schedule.strings)
+            previous = schedule.get(item.id)
+            if previous is not None:
+                stats.remove(previous)
+            schedule.append(item)
+            stats.add(item)
+        elif op == "update":
+            item = schedule.get(record["id"])
+            if item is not None:
+                stats.remove(item)
+                item = item.copy()
+                item.update(record["changes"])
+                schedule.append(item)
+                stats.add(item)
+        elif op == "delete":
+            item = schedule.remove_id(record["id"])
+            if item is not None:
+                stats.remove(item)
+
+    def _append(self, filename, records):
+        with file_lock(filename):
+            # ภายใต้ล็อกไม่มีผู้เขียนอื่นแทรก จึงปรับสถานะในแคชตาม log ได้ตรง ๆ โดยไม่ต้อง parse ใหม่
+            schedule, stats = self._state(filename)
+            # แก้/ลบ id ที่ไม่มีแล้ว (เช่นจากแท็บที่ค้างอยู่) ไม่ต้องลง log และไม่เพิ่มเวอร์ชัน
+            records = [r for r in records if r["op"] == "add" or r["id"] in schedule.positions]
+            if not records:
+                return
+            payload = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode("utf-8")
+            with open(self.log_filename(filename), "ab") as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+                size = f.tell()
+            metrics.count("bytes_written", len(payload))
+            from_version = schedule.version
+            changed, deleted = set(), set()
+            with state_lock(filename):
+                for record in records:
+                    self._apply(schedule, stats, record)
+                    schedule.version += 1
+                    item_id = record["item"]["id"] if record["op"] == "add" else record["id"]
+                    if record["op"] == "delete":
+                        changed.discard(item_id)
+                        deleted.add(item_id)
+                    else:
+                        deleted.discard(item_id)
+                        changed.add(item_id)
+            if size >= self.compact_bytes:
+                self._write(filename, schedule, stats)
+            else:
+                load_cache.put(filename, self._signature(filename), (schedule, stats))
+            self._log_changes(filename, from_version, schedule.version, changed, deleted)
+
+    def _write(self, filename, schedule, stats):
+        """เขียน snapshot และสถิติใหม่แบบ atomic แล้วล้าง log"""
+        self._write_snapshot(filename, schedule, stats)
+        log_file = self.log_filename(filename)
+        if os.path.exists(log_file):
+            os.remove(log_file)
+        load_cache.put(filename, self._signature(filename), (schedule, stats))
+
+    def add(self, filename, items):
+        self._append(filename, [{"op": "add", "item": item.to_dict()} for item in items])
+
+    def update_many(self, filename, updates):
+        self._append(filename, [
+            {"op": "update", "id": item_id, "changes": changes} for item_id, changes in updates.items()
+        ])
+
+    def delete_many(self, filename, item_ids):
+        self._append(filename, [{"op": "delete", "id": item_id} for item_id in dict.fromkeys(item_ids)])
+
+ITEM_COLUMNS = ("id", "subject", "date", "start", "end", "priority", "completed", "auto_generated")
+# "end" เป็นคำสงวนของ SQL จึงต้องครอบด้วยเครื่องหมายคำพูด
+QUOTED_COLUMNS = ", ".join(f'"{c}"' for c in ITEM_COLUMNS)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    email TEXT PRIMARY KEY,
+    password TEXT NOT NULL,
+    created_at TEXT
+);
+CREATE TABLE IF NOT EXISTS schedule_items (
+    id TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    date TEXT NOT NULL,
+    start TEXT NOT NULL,
+    "end" TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 3,
+    completed INTEGER NOT NULL DEFAULT 0,
+    auto_generated INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_items_owner_date_start ON schedule_items (owner, date, start);
+CREATE INDEX IF NOT EXISTS idx_items_owner_completed ON schedule_items (owner, completed);
+CREATE TABLE IF NOT EXISTS schedule_stats (
+    owner TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    key TEXT NOT NULL,
+    items INTEGER NOT NULL,
+    completed_items INTEGER NOT NULL,
+    minutes INTEGER NOT NULL,
+    completed_minutes INTEGER NOT NULL,
+    PRIMARY KEY (owner, dimension, key)
+);
+CREATE TABLE IF NOT EXISTS schedule_versions (
+    owner TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS schedule_changes (
+    owner TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (owner, item_id)
+);
+CREATE INDEX IF NOT EXISTS idx_changes_owner_version ON schedule_changes (owner, version);
+"""
+
+class SqliteStore(JsonStore):
+    """ผู้ใช้และรายการทั้งหมดในไฟล์ SQLite เดียว หนึ่ง connection ต่อ thread
+
+    การแก้ตารางทุกครั้งเป็น transaction แบบ BEGIN IMMEDIATE ซึ่งล็อกการเขียนตั้งแต่ก่อนอ่าน
+    แถวเดิม ผู้เขียนพร้อมกันจึงรอกันแทนที่จะปรับสถิติจากข้อมูลที่ล้าสมัย
+    """
+
+    def __init__(self, db_path=DEFAULT_DB):
+        self.db_path = db_path
+        self._local = threading.local()
+
+    @property
+    def conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            has_stats = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schedule_stats'"
+            ).fetchone()
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            if not has_stats:
+                # ฐานข้อมูลที่สร้างก่อนมีตารางสถิติ คำนวณสถิติของทุกคนครั้งเดียว
+                owners = [row[0] for row in conn.execute("SELECT DISTINCT owner FROM schedule_items")]
+                for owner in owners:
+                    self.verify_stats(owner)
+        return conn
+
+    @staticmethod
+    def _row_to_item(row, strings=None):
+        return ScheduleItem.from_dict(dict(row), strings)
+
+    @staticmethod
+    def _item_values(filename, item):
+        return (
+            filename, item.id, item.subject, item.date, item.start, item.end,
+            item.priority, int(item.completed), int(item.auto_generated),
+        )
+
+    # ---- ผู้ใช้ ----
+    def load_users(self):
+        rows = self.conn.execute("SELECT email, password, created_at FROM users")
+        return {row["email"]: {"password": row["password"], "created_at": row["created_at"]} for row in rows}
+
+    def save_users(self, users):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO users (email, password, created_at) VALUES (?, ?, ?)",
+                [(email, u["password"], u.get("created_at")) for email, u in users.items()],
+            )
+
+    def get_user(self, email):
+        row = self.conn.execute(
+            "SELECT password, created_at FROM users WHERE email = ?", (email,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def create_user(self, email, record):
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO users (email, password, created_at) VALUES (?, ?, ?)",
+                    (email, record["password"], record.get("created_at")),
+                )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    # ---- ตาราง ----
+    @contextmanager
+    def _transaction(self):
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def version(self, filename):
+        row = self.conn.execute("SELECT version FROM schedule_versions WHERE owner = ?", (filename,)).fetchone()
+        return row[0] if row else 0
+
+    def _bump_version(self, filename, changed=(), deleted=()):
+        """เพิ่มเวอร์ชันแล้วบันทึกว่ารายการ changed/deleted เปลี่ยนที่เวอร์ชันนี้ (ต้องเรียกภายใน transaction)"""
+        self.conn.execute(
+            "INSERT INTO schedule_versions VALUES (?, 1) "
+            "ON CONFLICT (owner) DO UPDATE SET version = version + 1",
+            (filename,),
+        )
+        version = self.version(filename)
+        self.conn.executemany(
+            "INSERT INTO schedule_changes VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (owner, item_id) DO UPDATE SET version = excluded.version, deleted = excluded.deleted",
+            [(filename, item_id, version, 0) for item_id in changed]
+            + [(filename, item_id, version, 1) for item_id in deleted],
+        )
+
+    def load(self, filename):
+        # อ่านเวอร์ชันก่อนรายการ ถ้ามีผู้เขียนแทรกระหว่างนั้น save จะเห็นว่าล้าสมัยแทนที่จะทับ
+        version = self.version(filename)
+        schedule = self.items_between(filename)
+        schedule.version = version
+        return schedule
+
+    def save(self, filename, schedule):
+        with self._transaction():
+            loaded_version = getattr(schedule, "version", None)
+            if loaded_version is not None and loaded_version != self.version(filename):
+                raise StaleWriteError(filename)
+            previous = {row[0] for row in self.conn.execute("SELECT id FROM schedule_items WHERE owner = ?", (filename,))}
+            self.conn.execute("DELETE FROM schedule_items WHERE owner = ?", (filename,))
+            self._insert(filename, schedule)
+            self._replace_stats(filename, ScheduleStats.from_schedule(schedule))
+            ids = {item.id for item in schedule}
+            self._bump_version(filename, ids, previous - ids)
+
+    def _replace_stats(self, filename, stats):
+        self.conn.execute("DELETE FROM schedule_stats WHERE owner = ?", (filename,))
+        self.conn.executemany(
+            "INSERT INTO schedule_stats VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (filename, dimension, key, *row)
+                for dimension, group in stats.groups.items()
+                for key, row in group.items()
+            ],
+        )
+
+    def _adjust_stats(self, filename, item, sign=1):
+        """ปรับแถวสถิติที่รายการนี้เกี่ยวข้อง (ต้องเรียกภายใน transaction)"""
+        for dimension, key, values in ScheduleStats.item_rows(item):
+            self.conn.execute(
+                "INSERT INTO schedule_stats VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (owner, dimension, key) DO UPDATE SET "
+                "items = items + excluded.items, "
+                "completed_items = completed_items + excluded.completed_items, "
+                "minutes = minutes + excluded.minutes, "
+                "completed_minutes = completed_minutes + excluded.completed_minutes",
+                (filename, dimension, key, *(sign * value for value in values)),
+            )
+            self.conn.execute(
+                "DELETE FROM schedule_stats WHERE owner = ? AND dimension = ? AND key = ? AND items <= 0",
+                (filename, dimension, key),
+            )
+
+    def _get_item(self, filename, item_id):
+        row = self.conn.execute(
+            f"SELECT {QUOTED_COLUMNS} FROM schedule_items WHERE owner = ? AND id = ?", (filename, item_id)
+        ).fetchone()
+        return self._row_to_item(row) if row else None
+
+    def _insert(self, filename, items):
+        placeholders = ", ".join("?" * (len(ITEM_COLUMNS) + 1))
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO schedule_items (owner, {QUOTED_COLUMNS}) VALUES ({placeholders})",
+            [self._item_values(filename, item) for item in items],
+        )
+
+    def add(self, filename, items):
+        with self._transaction():
+            self._insert(filename, items)
+            for item in items:
+                self._adjust_stats(filename, item)
+            self._bump_version(filename, [item.id for item in items])
+
+    def _update(self, filename, item_id, changes):
+        columns = [c for c in changes if c in ITEM_COLUMNS and c != "id"]
+        if not columns:
+            return False
+        item = self._get_item(filename, item_id)
+        if item is None:
+            return False
+        assignments = ", ".join(f'"{c}" = ?' for c in columns)
+        self.conn.execute(
+            f"UPDATE schedule_items SET {assignments} WHERE owner = ? AND id = ?",
+            [changes[c] for c in columns] + [filename, item_id],
+        )
+        self._adjust_stats(filename, item, -1)
+        item.update({c: changes[c] for c in columns})
+        self._adjust_stats(filename, item)
+        return True
+
+    def _delete(self, filename, item_id):
+        item = self._get_item(filename, item_id)
+        if item is None:
+            return False
+        self.conn.execute("DELETE FROM schedule_items WHERE owner = ? AND id = ?", (filename, item_id))
+        self._adjust_stats(filename, item, -1)
+        return True
+
+    def update_many(self, filename, updates):
+        """ทุกการแก้ไขอยู่ใน transaction เดียว"""
+        with self._transaction():
+            changed = [item_id for item_id, changes in updates.items() if self._update(filename, item_id, changes)]
+            if changed:
+                self._bump_version(filename, changed)
+
+    def delete_many(self, filename, item_ids):
+        with self._transaction():
+            deleted = [item_id for item_id in item_ids if self._delete(filename, item_id)]
+            if deleted:
+                self._bump_version(filename, (), deleted)
+
+    # ---- query ----
+    def _select(self, filename, start_date=None, end_date=None, subject=None):
+        sql = f"SELECT {QUOTED_COLUMNS} FROM schedule_items WHERE owner = ?"
+        params = [filename]
+        if subject is not None:
+            sql += " AND subject = ?"
+            params.append(subject)
+        if start_date is not None:
+            sql += " AND date >= ?"
+            params.append(start_date)
+        if end_date is not None:
+            sql += " AND date <= ?"
+            params.append(end_date)
+        sql += " ORDER BY date, start, priority"
+        return self.conn.execute(sql, params)
+
+    def items_between(self, filename, start_date=None, end_date=None, subject=None):
+        schedule = Schedule()
+        schedule.extend(
+            self._row_to_item(row, schedule.strings) for row in self._select(filename, start_date, end_date, subject)
+        )
+        return schedule
+
+    def iter_items(self, filename, start_date=None, end_date=None):
+        """อ่านแถวจาก cursor ทีละแถว ไม่โหลดทั้งตารางเข้าหน่วยความจำ"""
+        strings = {}
+        for row in self._select(filename, start_date, end_date):
+            yield self._row_to_item(row, strings)
+
+    def changes_since(self, filename, token=None):
+        """เหมือน JsonStore.changes_since แต่ token คือเลขเวอร์ชัน และ items ตอน full เป็น generator
+
+        อ่านเวอร์ชันก่อนรายการ ถ้ามีผู้เขียนแทรก รายการนั้นจะถูกส่งซ้ำในการซิงก์ครั้งถัดไปแทนที่จะหาย
+        """
+        version = self.version(filename)
+        parsed = parse_token(token)
+        if parsed is None or len(parsed) != 2 or parsed[0] != "v" or parsed[1] > version:
+            return {"token": f"v.{version}", "full": True, "items": self.iter_items(filename), "deleted": []}
+        since = parsed[1]
+        item_columns = ", ".join(f'i."{c}"' for c in ITEM_COLUMNS)
+        rows = self.conn.execute(
+            f"SELECT {item_columns} FROM schedule_changes c "
+            "JOIN schedule_items i ON i.owner = c.owner AND i.id = c.item_id "
+            "WHERE c.owner = ? AND c.version > ? AND c.deleted = 0 "
+            'ORDER BY i.date, i.start, i.priority',
+            (filename, since),
+        )
+        strings = {}
+        items = [self._row_to_item(row, strings) for row in rows]
+        deleted = [
+            row[0] for row in self.conn.execute(
+                "SELECT item_id FROM schedule_changes WHERE owner = ? AND version > ? AND deleted = 1 ORDER BY item_id",
+                (filename, since),
+            )
+        ]
+        return {"token": f"v.{version}", "full": False, "items": items, "deleted": deleted}
+
+    def _stored_stats(self, filename):
+        stats = ScheduleStats()
+        rows = self.conn.execute(
+            "SELECT dimension, key, items, completed_items, minutes, completed_minutes "
+            "FROM schedule_stats WHERE owner = ?",
+            (filename,),
+        )
+        for row in rows:
+            stats.groups.setdefault(row[0], {})[row[1]] = list(row[2:])
+        return stats
+
+    def stats(self, filename):
+        return self._stored_stats(filename).summary()
+
+    def verify_stats(self, filename):
+        with self._transaction():
+            fresh = ScheduleStats.from_schedule(self.items_between(filename))
+            if fresh == self._stored_stats(filename):
+                return True
+            self._replace_stats(filename, fresh)
+        return False
+
+def schedule_filename(email):
+    """ชื่อไฟล์ (หรือ owner ใน SQLite) ของตารางผู้ใช้ เช่น data_a_at_b_dot_c.json"""
+    return f"data_{email.replace('@', '_at_').replace('.', '_dot_')}.json"
+
+def get_store(mode=None):
+    mode = mode or os.environ.get("STUDY_PLANNER_STORAGE", "json")
+    if mode == "journal":
+        return JournalStore()
+    if mode == "sqlite":
+        return SqliteStore(os.environ.get("STUDY_PLANNER_DB", DEFAULT_DB))
+    return JsonStore()
+
+def migrate_to_sqlite(db_path, data_dir="."):
+    """นำเข้า users_database.json และ data_*.json (รวม log ของโหมด journal) เข้า SQLite"""
+    source = JournalStore()
+    target = SqliteStore(db_path)
+    source.users_filename = os.path.join(data_dir, USERS_FILENAME)
+    users = source.load_users()
+    target.save_users(users)
+    migrated = 0
+    for path in sorted(glob.glob(os.path.join(data_dir, "data_*.json"))):
+        # สำเนาที่ไม่มีเลขเวอร์ชันของต้นทาง จึงเขียนทับปลายทางได้เสมอ
+        target.save(os.path.basename(path), Schedule(source.load(path)))
+        migrated += 1
+    return len(users), migrated
+
+def verify_all_stats(store, data_dir="."):
+    """ตรวจสถิติของทุกตารางใน store คืนรายชื่อที่ไม่ตรงและถูกคำนวณใหม่"""
+    if isinstance(store, SqliteStore):
+        owners = [row[0] for row in store.conn.execute("SELECT DISTINCT owner FROM schedule_items")]
+    else:
+        owners = sorted(glob.glob(os.path.join(data_dir, "data_*.json")))
+    return [owner for owner in owners if not store.verify_stats(owner)]
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="เครื่องมือจัดการที่เก็บข้อมูล STUDY PLANNER")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate_parser = subparsers.add_parser("migrate", help="ย้ายไฟล์ JSON เดิมเข้า SQLite")
+    migrate_parser.add_argument("--db", default=DEFAULT_DB)
+    migrate_parser.add_argument("--dir", default=".")
+    migrate_users_parser = subparsers.add_parser("migrate-users", help="ย้าย users_database.json เข้า shard")
+    migrate_users_parser.add_argument("--dir", default=".")
+    verify_parser = subparsers.add_parser("verify-stats", help="คำนวณสถิติใหม่และแก้ส่วนที่ไม่ตรง")
+    verify_parser.add_argument("--dir", default=".")
+    args = parser.parse_args()
+    if args.command == "migrate":
+        user_count, file_count = migrate_to_sqlite(args.db, args.dir)
+        print(f"นำเข้าผู้ใช้ {user_count} คน และตาราง {file_count} ไฟล์ไปยัง {args.db}")
+    elif args.command == "migrate-users":
+        store = JsonStore()
+        store.users_filename = os.path.join(args.dir, USERS_FILENAME)
+        print(f"ผู้ใช้ใน shard ทั้งหมด {len(store.load_users())} คน ({store.users_dir})")
+    elif args.command == "verify-stats":
+        mismatched = verify_all_stats(get_store(), args.dir)
+        print(f"สถิติไม่ตรง {len(mismatched)} ตาราง" + "".join(f"\n- {name}" for name in mismatched))
@@ -0,0 +1,92 @@
+"""ทดสอบการเขียนพร้อมกันหลาย process กับ store ทุกโหมด (ไม่ควรมีการแก้ไขหาย)
+
+    python stress_test.py --dir /tmp/stress --mode journal --workers 8 --rounds 50
+"""
+import argparse
+import multiprocessing
+import os
+
+from scheduling import Schedule, ScheduleItem, to_day
+from storage import DEFAULT_DB, USERS_FILENAME, SqliteStore, get_store, load_cache, shard_cache
+
+def open_store(mode, data_dir):
+    if mode == "sqlite":
+        return SqliteStore(os.path.join(data_dir, DEFAULT_DB))
+    store = get_store(mode)
+    store.users_filename = os.path.join(data_dir, USERS_FILENAME)
+    return store
+
+def run_worker(mode, data_dir, filename, worker, rounds):
+    store = open_store(mode, data_dir)
+    mine = [item.id for item in store.items_between(filename, subject=f"seed-{worker}")]
+    counter_id = store.items_between(filename, subject="counter")[0].id
+    first_day = to_day("2030-01-01")
+
+    def increment(schedule):
+        counter = schedule.get(counter_id)
+        counter.priority += 1
+
+    for r in range(rounds):
+        store.update_many(filename, {item_id: {"completed": r % 2 == 0} for item_id in mine})
+        store.add(filename, [ScheduleItem(f"added-{worker}", first_day + r, worker * 60, worker * 60 + 30)])
+        store.create_user(f"stress-{worker}-{r}@example.com", {"password": "-", "created_at": None})
+        store.modify(filename, increment, retries=10 * rounds)
+
+def stress_test(data_dir, mode="json", workers=8, rounds=50):
+    """หลาย process แก้ตารางเดียวกันและสมัครผู้ใช้พร้อมกัน แล้วตรวจว่าไม่มีการแก้ไขหาย
+
+    แต่ละ process ติ๊ก/ยกเลิกรายการของตัวเอง เพิ่มรายการ สมัครผู้ใช้ และเพิ่มตัวนับผ่าน modify()
+    คืน list ข้อความของสิ่งที่ไม่ตรง (ว่าง = ผ่าน)
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    filename = os.path.join(data_dir, "data_stress.json")
+    store = open_store(mode, data_dir)
+    first_day = to_day("2030-01-01")
+    seed = [ScheduleItem("counter", first_day, 0, 30, priority=0)]
+    seed += [ScheduleItem(f"seed-{w}", first_day - 1 - i, w * 60, w * 60 + 30) for w in range(workers) for i in range(3)]
+    store.save(filename, Schedule(seed))
+
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(mode, data_dir, filename, w, rounds))
+        for w in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    errors = [f"process {i} จบด้วย exit code {p.exitcode}" for i, p in enumerate(processes) if p.exitcode]
+
+    load_cache.clear()
+    shard_cache.clear()
+    store = open_store(mode, data_dir)
+    expected_completed = (rounds - 1) % 2 == 0
+    for w in range(workers):
+        seeds = store.items_between(filename, subject=f"seed-{w}")
+        if any(item.completed != expected_completed for item in seeds):
+            errors.append(f"สถานะของ seed-{w} ไม่ตรงกับการติ๊กครั้งสุดท้าย")
+        added = len(store.items_between(filename, subject=f"added-{w}"))
+        if added != rounds:
+            errors.append(f"added-{w}: มี {added} รายการ คาดว่า {rounds}")
+    counter = store.items_between(filename, subject="counter")[0].priority
+    if counter != workers * rounds:
+        errors.append(f"ตัวนับจาก modify() เป็น {counter} คาดว่า {workers * rounds}")
+    users = store.load_users()
+    missing = [f"stress-{w}-{r}@example.com" for w in range(workers) for r in range(rounds)]
+    missing = [email for email in missing if email not in users]
+    if missing:
+        errors.append(f"ผู้ใช้หาย {len(missing)} คน")
+    if not store.verify_stats(filename):
+        errors.append("สถิติไม่ตรงกับตาราง")
+    return errors
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ทดสอบการเขียนพร้อมกันหลาย process ของ STUDY PLANNER")
+    parser.add_argument("--dir", required=True, help="โฟลเดอร์ว่างสำหรับไฟล์ทดสอบ")
+    parser.add_argument("--mode", choices=["json", "journal", "sqlite"], default="json")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    errors = stress_test(args.dir, args.mode, args.workers, args.rounds)
+    if errors:
+        parser.exit(1, "".join(f"- {error}\n" for error in errors))
+    print(f"ไม่มีการแก้ไขหาย ({args.workers} process x {args.rounds} รอบ, โหมด {args.mode})")
@@ -0,0 +1,6 @@
+"""หน้าต่าง ๆ ของแอป streamlit
+
+app.py import เฉพาะหน้าที่เปิดอยู่ (ui.login, ui.manual, ui.auto, ui.schedule_view)
+แต่ละหน้ามีฟังก์ชัน render() ส่วนที่ใช้ร่วมกันอยู่ใน ui.common
+โมดูลเหล่านี้ถูก import ครั้งเดียวต่อ process ทุก rerun จึงเรียกแค่ render() ไม่ต้องนิยามฟังก์ชันใหม่
+"""
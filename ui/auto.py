@@ -0,0 +1,79 @@
+"""หน้าเพิ่มตารางอัตโนมัติ (ทีละวิชาและหลายวิชาพร้อมกัน)"""
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from scheduling import auto_schedule_subject, plan_subjects
+from ui.common import store
+
+def render(filename):
+    st.subheader("🤖 เพิ่มตารางอ่านแบบอัตโนมัติ")
+    st.info("💡 ระบบจะจัดสรรเวลาอ่านให้อัตโนมัติจากวันนี้จนถึงวันสอบ (หลีกเลี่ยงเวลาทับซ้อน)")
+
+    with st.form("auto_add_form"):
+        subject = st.text_input("ชื่อวิชา")
+        exam_date = st.date_input("วันที่สอบ", min_value=datetime.now().date() + timedelta(days=1))
+        hours_per_day = st.number_input("ชั่วโมงที่อยากอ่านต่อวัน", min_value=0.5, max_value=6.0, value=2.0, step=0.5)
+        
+        submitted = st.form_submit_button("🤖 สร้างตารางอัตโนมัติ")
+
+        if submitted:
+            if subject.strip() == "":
+                st.error("กรุณาใส่ชื่อวิชา")
+            else:
+                auto_items = auto_schedule_subject(store, filename, subject.strip(), exam_date, hours_per_day)
+                
+                if not auto_items:
+                    st.error("ไม่สามารถสร้างตารางได้ เนื่องจากเวลาทับซ้อนหรือวันสอบใกล้เกินไป")
+                else:
+                    store.add(filename, auto_items)
+                    day_count = len({item.day for item in auto_items})
+                    st.success(f"✅ สร้างตารางอัตโนมัติเรียบร้อย! ({day_count} วัน)")
+                    
+                    st.subheader("📋 ตัวอย่างตารางที่สร้าง")
+                    for item in auto_items[:5]:
+                        st.write(f"📅 {item.date} | ⏰ {item.start}-{item.end} | 📚 {item.subject}")
+                    
+                    if len(auto_items) > 5:
+                        st.write(f"... และอีก {len(auto_items) - 5} รายการ")
+
+    st.markdown("### 📚 จัดตารางหลายวิชาพร้อมกัน")
+    st.caption("ระบบจะเฉลี่ยชั่วโมงของแต่ละวิชาไปจนถึงวันสอบ วิชาที่สอบก่อนได้จัดก่อน")
+
+    with st.form("multi_auto_form"):
+        tomorrow = datetime.now().date() + timedelta(days=1)
+        subject_rows = st.data_editor(
+            [{"วิชา": "", "วันที่สอบ": tomorrow, "ชั่วโมงรวม": 10.0, "ความสำคัญ": 3}],
+            num_rows="dynamic",
+            column_config={
+                "วันที่สอบ": st.column_config.DateColumn(min_value=tomorrow),
+                "ชั่วโมงรวม": st.column_config.NumberColumn(min_value=0.5, step=0.5),
+                "ความสำคัญ": st.column_config.NumberColumn(min_value=1, max_value=5, step=1),
+            },
+            use_container_width=True,
+        )
+        multi_submitted = st.form_submit_button("🤖 จัดตารางทุกวิชา")
+
+        if multi_submitted:
+            subjects = [
+                {
+                    "subject": row["วิชา"].strip(),
+                    "exam_date": row["วันที่สอบ"],
+                    "total_hours": row["ชั่วโมงรวม"],
+                    "priority": int(row["ความสำคัญ"] or 3),
+                }
+                for row in subject_rows
+                if row["วิชา"] and row["วิชา"].strip() and row["วันที่สอบ"] and row["ชั่วโมงรวม"]
+            ]
+            if not subjects:
+                st.error("กรุณาใส่อย่างน้อยหนึ่งวิชา")
+            else:
+                today = datetime.now().date()
+                last_exam = max(s["exam_date"] for s in subjects)
+                existing = store.items_between(filename, today.strftime("%Y-%m-%d"), last_exam.strftime("%Y-%m-%d"))
+                planned_items, unplaced = plan_subjects(subjects, existing, start_date=today)
+                if planned_items:
+                    store.add(filename, planned_items)
+                    st.success(f"✅ จัดตารางเรียบร้อย! ({len(planned_items)} ช่วง)")
+                for name, hours in unplaced.items():
+                    st.warning(f"⚠️ {name}: จัดไม่ลงอีก {hours:.1f} ชั่วโมง")
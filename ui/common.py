@@ -0,0 +1,86 @@
+"""ส่วนที่ทุกหน้าใช้ร่วมกัน: ตั้งค่าหน้า, store, ผู้ใช้ปัจจุบัน และการจับเวลาแต่ละรอบ"""
+import time
+
+import streamlit as st
+
+from metrics import DEBUG_PANEL, METRICS_FILE, metrics
+from storage import get_store, schedule_filename
+
+CSS = """
+    <style>
+    .title {
+        font-size: 28px;
+        font-weight: bold;
+        color: #3366cc;
+        margin-bottom: 10px;
+    }
+    .main {
+        background-color: #f5f8ff;
+    }
+    .completed {
+        text-decoration: line-through;
+        color: #888888;
+        background-color: #f0f0f0;
+        padding: 5px;
+        border-radius: 5px;
+    }
+    </style>
+"""
+
+# ทุก method ของ store ถูกจับเวลาเป็น "store.<method>"
+store = metrics.instrument(get_store(), "store")
+
+def setup_page():
+    """ตั้งค่าหน้าและค่าเริ่มต้นของ session (ต้องเรียกทุกรอบ ก่อนวาดส่วนอื่น)"""
+    st.set_page_config(
+        page_title="📘 STUDY PLANNER",
+        page_icon="📘",
+        layout="wide"
+    )
+    st.markdown(CSS, unsafe_allow_html=True)
+    st.session_state.setdefault("logged_in", False)
+    st.session_state.setdefault("current_user", None)
+
+def title():
+    st.markdown('<div class="title">📘 STUDY PLANNER</div>', unsafe_allow_html=True)
+
+def get_user_filename():
+    return schedule_filename(st.session_state.current_user["email"])
+
+# ---------------------- METRICS ----------------------
+def render_debug_panel():
+    with st.sidebar.expander("🛠 ข้อมูลประสิทธิภาพ"):
+        if not metrics.enabled:
+            st.caption("ปิดอยู่ (STUDY_PLANNER_METRICS_SAMPLE=0)")
+            return
+        snapshot = metrics.snapshot()
+        st.caption(f"รวมทุก session ใน process นี้ • สุ่มจับเวลา {metrics.sample_rate:.0%}")
+        last_rerun = snapshot["gauges"].get("rerun_last_seconds", 0)
+        counters = snapshot["counters"]
+        st.metric("รอบล่าสุด", f"{last_rerun * 1000:.0f} ms")
+        st.write(
+            f"ตรวจเวลาทับซ้อน {counters.get('conflict_checks', 0):,} ครั้ง • "
+            f"อ่าน {counters.get('bytes_read', 0) / 1024:,.0f} KB • "
+            f"เขียน {counters.get('bytes_written', 0) / 1024:,.0f} KB"
+        )
+        st.dataframe([
+            {
+                "ส่วน": name,
+                "ครั้งที่จับเวลา": count,
+                "เฉลี่ย (ms)": round(total / count * 1000, 2),
+                "นานสุด (ms)": round(slowest * 1000, 2),
+            }
+            for name, (count, total, slowest) in sorted(snapshot["timers"].items())
+        ], use_container_width=True)
+        st.download_button("⬇️ ดาวน์โหลด metrics (Prometheus)", metrics.to_prometheus(), file_name="study_planner.prom")
+
+def finish_rerun(started):
+    """บันทึกเวลาของรอบนี้นับจาก started (เรียกก่อน st.stop และท้ายสคริปต์ รอบที่จบด้วย st.rerun ไม่นับ)"""
+    if metrics.enabled:
+        elapsed = time.perf_counter() - started
+        metrics.observe("rerun", elapsed)
+        metrics.set_gauge("rerun_last_seconds", round(elapsed, 6))
+        if METRICS_FILE:
+            metrics.write_prometheus(METRICS_FILE)
+    if DEBUG_PANEL:
+        render_debug_panel()
@@ -0,0 +1,72 @@
+"""หน้าเข้าสู่ระบบและสมัครสมาชิก (ไม่ import ส่วนจัดตารางหรือหน้าแสดงตาราง)"""
+from datetime import datetime
+
+import streamlit as st
+
+from auth import AuthBusyError, authenticate, register
+from metrics import metrics
+from ui.common import store, title
+
+@metrics.timed("verify_user")
+def verify_user(email, password):
+    # ตรวจใน thread pool ของ auth และแฮชใหม่ให้บัญชีที่ยังใช้ SHA-256 แบบเดิม
+    return authenticate(store, email, password)
+
+def register_user(email, password):
+    # คืนค่า False ถ้ามีผู้ใช้นี้อยู่แล้ว
+    return register(store, email, password, datetime.now().isoformat())
+
+def render():
+    title()
+    st.caption("ผู้ช่วยจัดการตารางอ่านหนังสืออย่างมีระบบ ⏳📚")
+
+    # แท็บสำหรับเข้าสู่ระบบและสมัครสมาชิก
+    login_tab, register_tab = st.tabs(["🔑 เข้าสู่ระบบ", "📝 สมัครสมาชิก"])
+    
+    with login_tab:
+        with st.form("login_form"):
+            email = st.text_input("อีเมล")
+            password = st.text_input("รหัสผ่าน", type="password")
+            submitted = st.form_submit_button("เข้าสู่ระบบ")
+            
+            if submitted:
+                if email.strip() == "" or password.strip() == "":
+                    st.error("กรุณากรอกอีเมลและรหัสผ่าน")
+                else:
+                    try:
+                        valid = verify_user(email.strip(), password.strip())
+                    except AuthBusyError:
+                        st.warning("⏳ มีผู้เข้าสู่ระบบพร้อมกันจำนวนมาก กรุณาลองใหม่อีกครั้ง")
+                    else:
+                        if valid:
+                            st.session_state.logged_in = True
+                            st.session_state.current_user = {"email": email.strip()}
+                            st.success("✅ เข้าสู่ระบบเรียบร้อย")
+                            st.rerun()
+                        else:
+                            st.error("❌ อีเมลหรือรหัสผ่านไม่ถูกต้อง")
+    
+    with register_tab:
+        with st.form("register_form"):
+            reg_email = st.text_input("อีเมล")
+            reg_password = st.text_input("รหัสผ่าน", type="password")
+            reg_confirm_password = st.text_input("ยืนยันรหัสผ่าน", type="password")
+            reg_submitted = st.form_submit_button("สมัครสมาชิก")
+            
+            if reg_submitted:
+                if reg_email.strip() == "" or reg_password.strip() == "":
+                    st.error("กรุณากรอกอีเมลและรหัสผ่าน")
+                elif reg_password != reg_confirm_password:
+                    st.error("รหัสผ่านไม่ตรงกัน")
+                elif len(reg_password) < 6:
+                    st.error("รหัสผ่านต้องมีอย่างน้อย 6 ตัวอักษร")
+                else:
+                    try:
+                        created = register_user(reg_email.strip(), reg_password.strip())
+                    except AuthBusyError:
+                        st.warning("⏳ มีผู้ใช้งานพร้อมกันจำนวนมาก กรุณาลองใหม่อีกครั้ง")
+                    else:
+                        if created:
+                            st.success("✅ สมัครสมาชิกเรียบร้อย กรุณาเข้าสู่ระบบ")
+                        else:
+                            st.error("❌ อีเมลนี้ถูกใช้แล้ว")
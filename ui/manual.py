@@ -0,0 +1,46 @@
+"""หน้าเพิ่มตารางแบบกำหนดวันและเวลา"""
+import streamlit as st
+
+from scheduling import plan_manual_items
+from ui.common import store
+
+def render(filename):
+    st.subheader("➕ เพิ่มรายการอ่านหนังสือ (แบบกำหนดวันและเวลา)")
+
+    with st.form("add_form"):
+        subject = st.text_input("ชื่อวิชา")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            start_date = st.date_input("วันที่เริ่มต้น")
+        with col2:
+            end_date = st.date_input("วันที่สิ้นสุด")
+            
+        start_time = st.time_input("เวลาเริ่มต้น")
+        end_time = st.time_input("เวลาสิ้นสุด")
+        priority = st.number_input("ลำดับความสำคัญ (1 = สูงสุด)", min_value=1, max_value=5, value=3)
+        submitted = st.form_submit_button("➕ เพิ่มลงตาราง")
+
+        if submitted:
+            if subject.strip() == "":
+                st.error("กรุณาใส่ชื่อวิชา")
+            elif start_time >= end_time:
+                st.error("เวลาเริ่มต้องน้อยกว่าสิ้นสุด")
+            elif start_date > end_date:
+                st.error("วันที่เริ่มต้นต้องไม่เกินวันที่สิ้นสุด")
+            else:
+                # ตรวจเวลาทับซ้อนเฉพาะรายการในช่วงวันที่ที่จะเพิ่ม
+                existing = store.items_between(
+                    filename, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+                )
+                new_items, conflicts = plan_manual_items(
+                    existing, subject.strip(), start_date, end_date,
+                    start_time.hour * 60 + start_time.minute, end_time.hour * 60 + end_time.minute, priority,
+                )
+                
+                if new_items:
+                    store.add(filename, new_items)
+                    st.success(f"✅ เพิ่มตารางเรียบร้อยแล้ว! ({len(new_items)} วัน)")
+                
+                if conflicts:
+                    st.warning(f"⚠️ มีเวลาทับซ้อนในวันที่: {', '.join(conflicts)}")
@@ -0,0 +1,198 @@
+"""หน้าดูตาราง: สรุปความคืบหน้า, แก้หลายรายการ และตารางรายวัน"""
+from datetime import datetime
+
+import streamlit as st
+
+from export import FORMATS, export
+from metrics import metrics
+from scheduling import batch_conflicts, from_day, shift_changes
+from ui.common import store
+from views import build_daily_view, display_rows, item_markdown, view_window_end
+
+def render(filename):
+    st.subheader("📅 ตารางอ่านหนังสือของคุณ")
+    # สถิติสะสมที่ store ปรับทุกครั้งที่มีการแก้ไข ไม่ต้องไล่ทั้งตาราง
+    stats = store.stats(filename)
+    total_count = stats["total_count"]
+
+    if total_count == 0:
+        st.info("ยังไม่มีรายการ")
+    else:
+        total_hours = stats["total_hours"]
+        completed_count = stats["completed_count"]
+        completion_rate = (completed_count / total_count * 100) if total_count > 0 else 0
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("⏳ เวลารวม", f"{total_hours:.1f} ชั่วโมง")
+        with col2:
+            st.metric("✅ อ่านจบแล้ว", f"{completed_count}/{total_count}")
+        with col3:
+            st.metric("📊 ความคืบหน้า", f"{completion_rate:.1f}%")
+
+        with st.expander("📚 ความคืบหน้ารายวิชา"):
+            for subject_name, hours in sorted(stats["subject_hours"].items()):
+                done_ratio = hours["completed_hours"] / hours["hours"] if hours["hours"] else 0
+                st.progress(done_ratio, text=f"{subject_name}: {hours['completed_hours']:.1f}/{hours['hours']:.1f} ชั่วโมง")
+
+        # เลือกช่วงวันที่ที่จะแสดง ค่าเริ่มต้นคือวันนี้ (หรือวันใกล้ที่สุดที่มีตาราง) ถึงวันสุดท้าย
+        first_date = datetime.strptime(stats["first_date"], "%Y-%m-%d").date()
+        last_date = datetime.strptime(stats["last_date"], "%Y-%m-%d").date()
+        today = datetime.now().date()
+        default_start = min(max(today, first_date), last_date)
+
+        col1, col2 = st.columns([3, 2])
+        with col1:
+            date_range = st.date_input(
+                "ช่วงวันที่",
+                value=(default_start, last_date),
+                min_value=first_date,
+                max_value=last_date,
+            )
+        with col2:
+            hide_done = st.checkbox("ย่อวันที่ผ่านมาแล้วและอ่านครบ", value=True)
+
+        range_start = date_range[0] if date_range else default_start
+        range_end = date_range[1] if len(date_range) > 1 else range_start
+
+        # แสดงทีละสัปดาห์ กด "โหลดเพิ่ม" เพื่อขยาย เปลี่ยนช่วงวันที่แล้วเริ่มนับใหม่
+        if st.session_state.get("view_range") != (range_start, range_end):
+            st.session_state.view_range = (range_start, range_end)
+            st.session_state.view_weeks = 1
+        window_end = view_window_end(range_start, range_end, st.session_state.view_weeks)
+
+        # ดึงเฉพาะรายการในหน้าต่างที่แสดง เรียงตามวัน เวลา และความสำคัญ
+        schedule = store.items_between(filename, range_start.strftime("%Y-%m-%d"), window_end.strftime("%Y-%m-%d"))
+
+        # แก้หลายรายการพร้อมกัน: รวมการแก้ทั้งชุดในหน่วยความจำ บันทึกครั้งเดียว rerun ครั้งเดียว
+        with st.expander("🧰 จัดการหลายรายการ"):
+            tab_select, tab_subject, tab_range = st.tabs(["เลือกรายการ", "ทั้งวิชา", "ช่วงวันที่"])
+            with tab_select:
+                with st.form("bulk_select_form"):
+                    labels = {item.id: f"{item.date} {item.start}-{item.end} {item.subject}" for item in schedule}
+                    selected = st.multiselect("รายการในช่วงที่แสดง", list(labels), format_func=labels.get)
+                    action = st.selectbox("การทำงาน", ["ทำเครื่องหมายอ่านจบ", "ยกเลิกอ่านจบ", "ลบ"], key="bulk_select_action")
+                    if st.form_submit_button("ดำเนินการ") and selected:
+                        if action == "ลบ":
+                            store.delete_many(filename, selected)
+                        else:
+                            done = action == "ทำเครื่องหมายอ่านจบ"
+                            store.update_many(filename, {item_id: {"completed": done} for item_id in selected})
+                        st.rerun()
+            with tab_subject:
+                with st.form("bulk_subject_form"):
+                    subject_name = st.selectbox("วิชา", sorted(stats["subject_hours"]))
+                    action = st.radio("การทำงาน", ["เลื่อนวัน", "ลบทั้งหมด"], horizontal=True, key="bulk_subject_action")
+                    shift_days = st.number_input("เลื่อนกี่วัน (ติดลบ = เลื่อนถอยหลัง)", value=1, step=1)
+                    if st.form_submit_button("ดำเนินการ"):
+                        items = store.items_between(filename, subject=subject_name)
+                        if action == "ลบทั้งหมด":
+                            store.delete_many(filename, [item.id for item in items])
+                            st.rerun()
+                        elif items and shift_days:
+                            updates = shift_changes(items, shift_days)
+                            # ตรวจกับรายการอื่นในช่วงวันปลายทางทั้งชุดก่อนบันทึก
+                            nearby = store.items_between(filename, from_day(items[0].day + shift_days), from_day(items[-1].day + shift_days))
+                            conflicts = batch_conflicts([*nearby, *items], updates)
+                            if conflicts:
+                                first = conflicts[0]
+                                target_date = from_day(first.day + shift_days)
+                                st.error(f"❌ เลื่อนไม่ได้: ชนกับรายการอื่น {len(conflicts)} รายการ (เช่น {target_date} {first.start}-{first.end})")
+                            else:
+                                store.update_many(filename, updates)
+                                st.rerun()
+            with tab_range:
+                with st.form("bulk_range_form"):
+                    done_range = st.date_input(
+                        "ช่วงวันที่",
+                        value=(range_start, window_end),
+                        min_value=first_date,
+                        max_value=last_date,
+                        key="bulk_done_range",
+                    )
+                    if st.form_submit_button("✅ ทำเครื่องหมายอ่านจบทั้งช่วง") and done_range:
+                        done_end = done_range[1] if len(done_range) > 1 else done_range[0]
+                        items = store.items_between(filename, done_range[0].strftime("%Y-%m-%d"), done_end.strftime("%Y-%m-%d"))
+                        updates = {item.id: {"completed": True} for item in items if not item.completed}
+                        if updates:
+                            store.update_many(filename, updates)
+                            st.rerun()
+
+        st.markdown("### 🧩 ตารางรายวัน")
+        with metrics.timer("render.daily_view"):
+            for day_view in build_daily_view(schedule, today.toordinal(), hide_done):
+                d = day_view["date"]
+                daily = day_view["items"]
+                if day_view["collapsed"]:
+                    st.caption(f"📆 {d} — ✅ อ่านครบแล้ว ({len(daily)} รายการ)")
+                    continue
+                st.subheader(f"📆 {d}")
+            
+                for item in daily:
+                    completed = item.completed
+                
+                    col1, col2, col3, col4 = st.columns([1, 5, 1, 1])
+                
+                    with col1:
+                        # Checkbox สำหรับติ๊กว่าอ่านจบแล้ว
+                        # ใส่สถานะไว้ใน key เพื่อให้ได้ widget ใหม่เมื่อสถานะถูกเปลี่ยนจากที่อื่น (เช่น แก้หลายรายการ)
+                        checkbox_key = f"complete-{item.id}-{int(completed)}"
+                        new_status = st.checkbox(
+                            "อ่านจบ", 
+                            value=completed, 
+                            key=checkbox_key
+                        )
+                    
+                        # อัพเดทสถานะถ้าเปลี่ยน
+                        if new_status != completed:
+                            store.update(filename, item.id, completed=new_status)
+                        
+                            st.success("✅ อัพเดทสถานะแล้ว" if new_status else "⏳ ยกเลิกสถานะแล้ว")
+                            st.rerun()
+                
+                    with col2:
+                        # แสดงข้อมูลตาราง
+                        content = item_markdown(item)
+                    
+                        if completed:
+                            st.markdown(f'<div class="completed">{content}</div>', unsafe_allow_html=True)
+                        else:
+                            st.markdown(content)
+                
+                    with col3:
+                        if completed:
+                            st.success("✅")
+                        else:
+                            st.info("⏳")
+                
+                    with col4:
+                        if st.button("🗑", key=f"del-{item.id}"):
+                            store.delete(filename, item.id)
+                            st.rerun()
+
+        if window_end < range_end:
+            st.caption(f"แสดงถึงวันที่ {window_end.strftime('%Y-%m-%d')}")
+            if st.button("⬇️ โหลดเพิ่มอีก 1 สัปดาห์"):
+                st.session_state.view_weeks += 1
+                st.rerun()
+
+        # แสดงตารางของช่วงที่เลือก
+        st.markdown("### 🔍 ตารางในช่วงที่แสดง")
+        
+        st.dataframe(display_rows(schedule), use_container_width=True)
+
+        # ส่งออกทั้งตาราง สร้างไฟล์ตอนกดดาวน์โหลดเท่านั้น (data เป็น callable) ไม่ใช่ทุก rerun
+        with st.expander("📤 ส่งออกไปยังแอปปฏิทิน"):
+            st.caption("นำไฟล์ .ics เข้า Google Calendar, Apple Calendar หรือ Outlook ได้ "
+                       "ซิงก์เฉพาะส่วนที่เปลี่ยนได้ด้วย python batch.py export --token-file")
+            col1, col2 = st.columns(2)
+            for column, fmt, label in ((col1, "ics", "⬇️ iCalendar (.ics)"), (col2, "csv", "⬇️ CSV")):
+                with column:
+                    st.download_button(
+                        label,
+                        data=lambda fmt=fmt: "".join(export(store, filename, fmt)),
+                        file_name=f"study_plan.{fmt}",
+                        mime=FORMATS[fmt][1],
+                        on_click="ignore",
+                        key=f"export-{fmt}",
+                    )
@@ -0,0 +1,50 @@
+"""ข้อมูลสำหรับหน้า "ดูตาราง" แยกจาก streamlit เพื่อให้ทดสอบและวัดความเร็วได้โดยไม่ต้องเปิดแอป"""
+from datetime import timedelta
+
+from scheduling import ScheduleIndex, from_day
+
+PRIORITY_ICONS = {1: "🔴", 2: "🟠", 3: "🟡", 4: "🔵", 5: "🟢"}
+
+def priority_icon(priority):
+    return PRIORITY_ICONS.get(priority, "⚪")
+
+def view_window_end(range_start, range_end, weeks):
+    """วันสุดท้ายที่แสดงเมื่อโหลดมาแล้ว weeks สัปดาห์ (ไม่เกิน range_end)"""
+    return min(range_end, range_start + timedelta(weeks=weeks) - timedelta(days=1))
+
+def build_daily_view(schedule, today_day, hide_done=True):
+    """จัดกลุ่มรายการเป็นรายวันเรียงตามวัน
+
+    คืน list ของ dict {"day", "date", "items", "collapsed"} โดย items เรียงตามเวลาเริ่มและความสำคัญ
+    วันที่ผ่านมาแล้วและอ่านครบทุกรายการจะ collapsed=True เมื่อ hide_done
+    """
+    index = schedule if isinstance(schedule, ScheduleIndex) else ScheduleIndex(schedule)
+    days = []
+    for day in index.days():
+        daily = index.items_on(day)
+        collapsed = hide_done and day < today_day and all(item.completed for item in daily)
+        if not collapsed:
+            daily.sort(key=lambda x: (x.start_minute, x.priority))
+        days.append({"day": day, "date": from_day(day), "items": daily, "collapsed": collapsed})
+    return days
+
+def item_markdown(item):
+    auto_badge = "🤖" if item.auto_generated else ""
+    return (f"{priority_icon(item.priority)} "
+            f"**{item.start} - {item.end}** | "
+            f"{item.subject} {auto_badge} | "
+            f"⭐ ความสำคัญ: {item.priority}")
+
+def display_rows(schedule):
+    """แถวของตาราง "ตารางในช่วงที่แสดง" """
+    return [
+        {
+            "วันที่": item.date,
+            "วิชา": item.subject,
+            "เวลา": f"{item.start} - {item.end}",
+            "ความสำคัญ": item.priority,
+            "สถานะ": "✅ เสร็จแล้ว" if item.completed else "⏳ ยังไม่เสร็จ",
+            "ประเภท": "🤖 อัตโนมัติ" if item.auto_generated else "✋ กรอกเอง",
+        }
+        for item in schedule
+    ]